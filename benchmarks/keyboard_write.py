@@ -0,0 +1,97 @@
+"""
+Cached INPUT records against building them per event, EX: python benchmarks/keyboard_write.py
+
+Runs Win32Backend on a stub user32 so only the Python side is timed. The
+uncached path does what the send path did before records were cached: a
+fresh INPUT per event, a MapVirtualKeyExW call for its scan code and a
+new ctypes array per send. Real user32 calls go through the FFI, so on
+Windows every MapVirtualKeyExW saved is worth more than it is here.
+"""
+import ctypes
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import controller  # noqa: E402
+from controller import Keyboard  # noqa: E402
+
+TEXT: str = "The quick brown fox jumps over the lazy dog 0123456789. " * 16
+
+
+class StubUser32:
+  """
+  The user32 calls the send path makes, none of them do anything
+  """
+
+  def SendInput(self, count, inputs, size):
+    return count
+
+  def MapVirtualKeyExW(self, vk, map_type, layout):
+    return vk
+
+  def GetKeyboardLayout(self, thread):
+    return 0x04090409
+
+  def GetForegroundWindow(self):
+    return None
+
+  def GetWindowThreadProcessId(self, hwnd, process_id):
+    return 0
+
+
+USER32: StubUser32 = StubUser32()
+
+
+def uncached_input(vk: int, flags: int = 0) -> Keyboard.INPUT:
+  record: Keyboard.INPUT = Keyboard.INPUT(
+    type=Keyboard.INPUT_KEYBOARD, ki=controller.KEYBDINPUT(wVk=vk, dwFlags=flags))
+  record.ki.wScan = USER32.MapVirtualKeyExW(vk, Keyboard.MAPVK_VK_TO_VSC, 0)
+  return record
+
+
+def uncached_send(inputs: list[Keyboard.INPUT]) -> None:
+  size: int = ctypes.sizeof(Keyboard.INPUT)
+  for start in range(0, len(inputs), Keyboard.MAX_BATCH):
+    chunk: list[Keyboard.INPUT] = inputs[start:start + Keyboard.MAX_BATCH]
+    USER32.SendInput(len(chunk), (Keyboard.INPUT * len(chunk))(*chunk), size)
+
+
+def uncached_press_and_release(vk: int) -> None:
+  uncached_send([uncached_input(vk)])
+  uncached_send([uncached_input(vk, Keyboard.KEYEVENTF_KEYUP)])
+
+
+def uncached_write(text: str) -> None:
+  shift: int = Keyboard.vk_codes["shift"]
+  inputs: list[Keyboard.INPUT] = []
+  for char in text:
+    key: Keyboard.KeyHandle = Keyboard.index.chars[char]
+    inputs.append(uncached_input(shift, 0 if key.shift else Keyboard.KEYEVENTF_KEYUP))
+    inputs.append(uncached_input(key.vk))
+    inputs.append(uncached_input(key.vk, Keyboard.KEYEVENTF_KEYUP))
+  uncached_send(inputs)
+
+
+def best(function, number: int) -> float:
+  return min(timeit.repeat(function, number=number, repeat=7)) / number
+
+
+def main() -> None:
+  backend: Keyboard.Win32Backend = Keyboard.Win32Backend()
+  backend._user32 = USER32
+  Keyboard.setBackend(backend)
+  vk: int = Keyboard.vk_codes["a"]
+  for name, old, new, number in (
+      ("pressAndReleaseKey", lambda: uncached_press_and_release(vk),
+       lambda: Keyboard.pressAndReleaseKey(vk), 20000),
+      (f"keyboardWrite ({len(TEXT)} chars)", lambda: uncached_write(TEXT),
+       lambda: Keyboard.keyboardWrite(TEXT), 50)):
+    before: float = best(old, number)
+    after: float = best(new, number)
+    print(f"{name:28} uncached {before * 1e6:9.1f} us  cached {after * 1e6:9.1f} us  {before / after:5.1f}x")
+
+
+if __name__ == "__main__":
+  main()
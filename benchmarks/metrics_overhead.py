@@ -0,0 +1,61 @@
+"""
+Cost of the metrics hook on the send path, EX: python benchmarks/metrics_overhead.py
+
+Times Keyboard._sendData with one key down/up pair against NullBackend
+with metrics disabled and enabled, next to the same send loop with no
+hook at all, best of interleaved runs so scheduler noise drops out.
+"""
+import ctypes
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+
+NUMBER: int = 100000
+REPEAT: int = 6
+
+
+def send_unhooked(data: bytes, chunk_size: int | None = None) -> None:
+  # _sendData as it was before metrics, the baseline the hook is measured against
+  backend = Keyboard.backend or Keyboard.getBackend()
+  size: int = ctypes.sizeof(Keyboard.INPUT)
+  limiter = Keyboard.rate_limiter
+  events: int = min(chunk_size or Keyboard.MAX_BATCH, Keyboard.MAX_BATCH)
+  if limiter is not None:
+    events = min(events, limiter.burst)
+  step: int = events * size
+  with Keyboard._buffer_lock:
+    for start in range(0, len(data), step):
+      chunk: bytes = data[start:start + step]
+      if limiter is not None:
+        limiter.acquire(len(chunk) // size)
+      Keyboard._buffer_view[:len(chunk)] = chunk
+      backend.sendInput(len(chunk) // size, Keyboard._buffer, size)
+
+
+def best(function) -> float:
+  return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+def main() -> None:
+  Keyboard.setBackend(Keyboard.NullBackend())
+  data: bytes = Keyboard._keyRecord(0x41) + Keyboard._keyRecord(0x41, Keyboard.KEYEVENTF_KEYUP)
+  unhooked = disabled = enabled = float("inf")
+  # Interleaved so a noisy stretch hits every variant alike
+  for _ in range(5):
+    Keyboard.enableMetrics(False)
+    unhooked = min(unhooked, best(lambda: send_unhooked(data)))
+    disabled = min(disabled, best(lambda: Keyboard._sendData(data)))
+    Keyboard.enableMetrics(True)
+    enabled = min(enabled, best(lambda: Keyboard._sendData(data)))
+  Keyboard.enableMetrics(False)
+  print(f"no hook           {unhooked * 1e9:8.0f} ns/call")
+  print(f"metrics disabled  {disabled * 1e9:8.0f} ns/call  ({(disabled - unhooked) * 1e9:+.0f} ns)")
+  print(f"metrics enabled   {enabled * 1e9:8.0f} ns/call  ({(enabled - unhooked) * 1e9:+.0f} ns)")
+
+
+if __name__ == "__main__":
+  main()
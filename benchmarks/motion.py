@@ -0,0 +1,59 @@
+"""
+Cursor path cost, EX: python benchmarks/motion.py
+
+Times generating a long Bezier path, packing it with Motion.toRecords
+and sending it as glideCursor does, against building an INPUT per point
+and sending each on its own. Runs on NullBackend with sleeps skipped.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import controller  # noqa: E402
+from controller import Keyboard  # noqa: E402
+
+POINTS: int = 10000
+SCREEN: tuple[int, int] = (1920, 1080)
+
+
+def best(function) -> tuple[float, int]:
+  # Best time of 7 runs and the SendInput calls one run made
+  backend: Keyboard.NullBackend = Keyboard.getBackend()
+  calls: int = backend.calls
+  times: list[float] = []
+  for _ in range(7):
+    start: float = time.perf_counter()
+    function()
+    times.append(time.perf_counter() - start)
+  return min(times), (backend.calls - calls) // 7
+
+
+def per_point(points: list[tuple[int, int]]) -> None:
+  flags: int = Keyboard.MOUSEEVENTF_MOVE | Keyboard.MOUSEEVENTF_ABSOLUTE
+  for x, y in points:
+    record: Keyboard.INPUT = Keyboard.INPUT(type=Keyboard.INPUT_MOUSE, mi=controller.MOUSEINPUT(
+      dx=round(x * 65535 / (SCREEN[0] - 1)), dy=round(y * 65535 / (SCREEN[1] - 1)), dwFlags=flags))
+    Keyboard._sendData(bytes(record))
+
+
+def main() -> None:
+  backend: Keyboard.NullBackend = Keyboard.NullBackend()
+  backend.screen = SCREEN
+  Keyboard.setBackend(backend)
+  shape = Keyboard.Motion.bezier
+  points: list[tuple[int, int]] = shape((0, 0), (1919, 1079), POINTS, ease=Keyboard.Motion.easeInOut)
+  for name, function in (
+      (f"{POINTS} point bezier path", lambda: shape((0, 0), (1919, 1079), POINTS, ease=Keyboard.Motion.easeInOut)),
+      ("packing with toRecords", lambda: Keyboard.Motion.toRecords(points, SCREEN)),
+      # 120 points a second at 60 frames a second, two points per SendInput
+      ("glideCursor, path to sends", lambda: Keyboard.glideCursor(
+        1919, 1079, duration=POINTS / 120, path="bezier", sleep=lambda seconds: None)),
+      ("one INPUT and send per point", lambda: per_point(points))):
+    seconds, calls = best(function)
+    print(f"{name:30} {seconds * 1e3:8.2f} ms  {calls:6} SendInput calls")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,53 @@
+"""
+Calls per second through Keyboard.Raw and the friendly API, EX: python benchmarks/raw_path.py
+
+Both run against NullBackend, so what is left is the Python in front of
+SendInput: type checks, key lookups and error formatting on the friendly
+side, nothing but the cached records on the Raw side.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+
+SECONDS: float = 0.25
+
+
+def calls_per_second(function) -> float:
+  calls: int = 0
+  end: float = time.perf_counter() + SECONDS
+  while time.perf_counter() < end:
+    for _ in range(1000):
+      function()
+    calls += 1000
+  return calls / SECONDS
+
+
+def compare(friendly, raw) -> tuple[float, float]:
+  # Best of interleaved runs, so a noisy stretch hits both layers alike
+  slow: float = 0.0
+  fast: float = 0.0
+  for _ in range(5):
+    slow = max(slow, calls_per_second(friendly))
+    fast = max(fast, calls_per_second(raw))
+  return slow, fast
+
+
+def main() -> None:
+  Keyboard.setBackend(Keyboard.NullBackend())
+  vk: int = Keyboard.vk_codes["f15"]
+  handle: Keyboard.KeyHandle = Keyboard.resolve("f15")
+  for name, friendly, raw in (
+      ("press", lambda: Keyboard.pressKey("f15"), lambda: Keyboard.Raw.press(vk)),
+      ("release", lambda: Keyboard.releaseKey("f15"), lambda: Keyboard.Raw.release(vk)),
+      ("press and release", lambda: Keyboard.pressAndReleaseKey("f15"), lambda: Keyboard.Raw.tap(vk)),
+      ("press and release, handle", lambda: Keyboard.pressAndReleaseKey(handle), lambda: Keyboard.Raw.tap(handle.vk))):
+    slow, fast = compare(friendly, raw)
+    print(f"{name:26} friendly {slow:12,.0f}/s  Raw {fast:12,.0f}/s  {fast / slow:4.1f}x")
+
+
+if __name__ == "__main__":
+  main()
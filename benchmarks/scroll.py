@@ -0,0 +1,61 @@
+"""
+Scroll throughput, EX: python benchmarks/scroll.py
+
+Scrolls the same mixed run of notches three ways against NullBackend:
+one mouseScroll per notch (one SendInput each, like the old mouse_event
+path), through a Scroller and through scrollSequence. Prints notches
+per second and how many SendInput calls each made, NullBackend costs
+nothing per call so on Windows the gap widens by a syscall per notch.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+
+NOTCHES: int = 200
+ROUNDS: int = 500
+# Ten notches down, two right, and again
+STEPS: list[tuple[str, int]] = ([("down", 1)] * 10 + [("right", 1)] * 2) * (NOTCHES // 12)
+AXES: dict[str, tuple[str, int]] = {"down": ("v", -1), "right": ("h", 1)}
+
+
+def per_notch() -> None:
+  for direction, amount in STEPS:
+    axis, sign = AXES[direction]
+    Keyboard.mouseScroll(axis, sign * amount)
+
+
+def scroller() -> None:
+  with Keyboard.Scroller(autoflush=False) as scroll:
+    for direction, amount in STEPS:
+      axis, sign = AXES[direction]
+      scroll.scroll(axis, sign * amount)
+
+
+def sequence() -> None:
+  Keyboard.scrollSequence(STEPS)
+
+
+def measure(function) -> tuple[float, int]:
+  backend: Keyboard.NullBackend = Keyboard.NullBackend()
+  Keyboard.setBackend(backend)
+  best: float = float("inf")
+  for _ in range(5):
+    start: float = time.perf_counter()
+    for _ in range(ROUNDS // 5):
+      function()
+    best = min(best, time.perf_counter() - start)
+  return len(STEPS) * (ROUNDS // 5) / best, backend.calls // 5 // (ROUNDS // 5)
+
+
+def main() -> None:
+  for name, function in (("mouseScroll per notch", per_notch), ("Scroller", scroller), ("scrollSequence", sequence)):
+    rate, calls = measure(function)
+    print(f"{name:22} {rate:12,.0f} notches/s  {calls:4} SendInput calls per {len(STEPS)} notches")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,53 @@
+"""
+Per-tick cost of each keep-awake strategy, EX: python benchmarks/strategies.py
+
+Ticks every strategy against RecordingBackend and prints the time per
+tick with the INPUT events and SendInput calls each one costs.
+PowerStrategy never ticks, it makes one request when the worker starts
+running and one when it stops, so its row times that pair on
+FakePowerBackend instead.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+from engine import FakePowerBackend, KeyPressStrategy, MouseNudgeStrategy, PowerStrategy  # noqa: E402
+
+TICKS: int = 20000
+
+
+def measure(function) -> tuple[float, int, int]:
+  backend: Keyboard.RecordingBackend = Keyboard.RecordingBackend()
+  Keyboard.setBackend(backend)
+  best: float = float("inf")
+  for _ in range(5):
+    backend.clear()
+    best = min(best, timeit.timeit(function, number=TICKS) / TICKS)
+  # clear() zeroes the counters too, so they hold the last run only
+  return best, len(backend.events) // TICKS, backend.calls // TICKS
+
+
+def power_cycle(strategy: PowerStrategy) -> None:
+  strategy.acquire()
+  strategy.release()
+
+
+def main() -> None:
+  key: KeyPressStrategy = KeyPressStrategy(Keyboard.vk_codes["f15"])
+  still: MouseNudgeStrategy = MouseNudgeStrategy(0)
+  nudge: MouseNudgeStrategy = MouseNudgeStrategy(1)
+  power: PowerStrategy = PowerStrategy(backend=FakePowerBackend())
+  for name, function in (
+      ("key press (f15)", key.tick),
+      ("mouse nudge 0,0", still.tick),
+      ("mouse nudge +1/-1", nudge.tick),
+      ("power, acquire+release", lambda: power_cycle(power))):
+    seconds, events, calls = measure(function)
+    print(f"{name:24} {seconds * 1e6:7.2f} us/tick  {events} events  {calls} SendInput calls")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,41 @@
+"""
+unicodeWrite against keyboardWrite, EX: python benchmarks/unicode_write.py
+
+Types the same clipboard-sized paste both ways on NullBackend and prints
+the time, INPUT events and SendInput calls per paste. keyboardWrite needs
+a VK and shift handling per character, unicodeWrite sends every UTF-16
+unit as it is. A second paste with accents and emoji shows what only the
+unicode path can type, and what a smaller chunk_size costs.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+
+ASCII: str = "Lorem ipsum dolor sit amet, consectetur adipiscing elit; Sed DO eiusmod (42)!\n" * 64
+WIDE: str = "Café naïve über — \U0001f600 日本語\n" * 128
+
+
+def measure(function) -> tuple[float, int, int]:
+  backend: Keyboard.NullBackend = Keyboard.NullBackend()
+  Keyboard.setBackend(backend)
+  seconds: float = min(timeit.repeat(function, number=20, repeat=5)) / 20
+  runs: int = 20 * 5
+  return seconds, backend.sent // runs, backend.calls // runs
+
+
+def main() -> None:
+  for name, function in (
+      (f"keyboardWrite, {len(ASCII)} ascii chars", lambda: Keyboard.keyboardWrite(ASCII)),
+      (f"unicodeWrite, {len(ASCII)} ascii chars", lambda: Keyboard.unicodeWrite(ASCII)),
+      (f"unicodeWrite, {len(WIDE)} wide chars", lambda: Keyboard.unicodeWrite(WIDE)),
+      ("  chunk_size=64", lambda: Keyboard.unicodeWrite(WIDE, 64))):
+    seconds, events, calls = measure(function)
+    print(f"{name:36} {seconds * 1e3:8.3f} ms  {events:6} events  {calls:4} SendInput calls")
+
+
+if __name__ == "__main__":
+  main()
@@ -2,7 +2,7 @@
 
 
 a = Analysis(
-    ['src\\main.py', 'src\\controller.py'],
+    ['src\\main.py', 'src\\engine.py', 'src\\controller.py'],
     pathex=[],
     binaries=[],
     datas=[('icon.ico', '.')],
@@ -3,12 +3,23 @@
 # GITHUB: https://github.com/itzCozi/Py-Keyboard-Class
 
 import ctypes
+import functools
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
 import time
+from array import array
+from collections import deque
 from ctypes import wintypes
-from typing import Any, Literal, Self, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Self, Tuple
 
-import win32api
-from win32con import *
+if TYPE_CHECKING:
+  from concurrent.futures import ThreadPoolExecutor
 
 
 class Keyboard:
@@ -20,16 +31,34 @@ class Keyboard:
   |------------------------------------------------|
   | class  ManipulateMouse: Mouse controller class |
   | func   mouseScroll: Bare-bones mouse scroller  |
+  | func   resolve: Validates a key for reuse      |
   | func   getKeyState: Returns given key's state  |
+  | func   snapshotKeys: All key states, one call  |
   | func   moveCursor: Moves cursor to a position  |
+  | func   glideCursor: Moves cursor along a path  |
+  | func   nudgeMouse: Jiggles mouse in one call   |
   | func   scrollMouse: Scrolls the mouse wheel    |
+  | func   scrollSequence: Mixed scrolls, one call |
+  | class  Scroller: Merges scrolls in a window    |
   | func   pressMouse: Sends a VK input to mouse   |
   | func   releaseMouse: Halt VK signal            |
   | func   pressKey: Presses given key hex code    |
   | func   releaseKey: Stop given VK input         |
   | func   pressAndReleaseKey: N/A                 |
   | func   pressAndReleaseMouse: N/A               |
+  | func   doubleClickMouse: Two clicks, one call  |
+  | func   dragMouse: Down, moves and up together  |
   | func   keyboardWrite: Sends vk inputs          |
+  | func   setBackend: Picks where inputs are sent |
+  | func   setRateLimit: Caps events per second    |
+  | func   enableMetrics: Counters and histograms  |
+  | class  InputBackend: Win32/Null/Recording      |
+  | class  Raw: Unchecked fast-path key functions  |
+  | func   runMacro: Runs a (cached) macro string  |
+  | func   unicodeWrite: Types any text, no VKs    |
+  | class  AsyncKeyboard: asyncio front end        |
+  | class  InputRecorder: Hooked input to a Macro  |
+  | func   recordInput: Validated InputRecorder    |
   --------------------------------------------------
   """
 
@@ -44,25 +73,42 @@ class Keyboard:
     Display error messages based on the type of error encountered.
     """
     if error_type == "p":
-      print(f"PARAMETER - Given variable {var} is not a {type}.")
+      kind, message = "parameter", f"PARAMETER - Given variable {var} is not a {type}."
     elif error_type == "r":
-      print(f"RUNTIME - {runtime_error.capitalize()}.")
+      kind, message = "runtime", f"RUNTIME - {runtime_error.capitalize()}."
     elif error_type == "u":
-      print("UNKNOWN - An unknown error was encountered.")
+      kind, message = "unknown", "UNKNOWN - An unknown error was encountered."
+    else:
+      return None
+    print(message)
+    Keyboard.error_count += 1
+    # Nobody sees the print in the windowed exe, metrics keep it around
+    if Keyboard.metrics is not None:
+      Keyboard.metrics.fail(kind, message)
     return None
 
   exit_code: None = None  # Exit code for error handling
+  error_count: int = 0  # Errors reported so far, exit_code alone can't tell a failed call apart
   INPUT_MOUSE: int = 0
   WM_KEYUP: int = 0x0101
   INPUT_KEYBOARD: int = 1
   WH_KEYBOARD_LL: int = 13
+  WH_MOUSE_LL: int = 14
+  WM_QUIT: int = 0x0012
   MAPVK_VK_TO_VSC: int = 0
   WM_KEYDOWN: int = 0x0100
   KEYEVENTF_KEYUP: int = 0x0002
   KEYEVENTF_UNICODE: int = 0x0004
   KEYEVENTF_SCANCODE: int = 0x0008
   KEYEVENTF_EXTENDEDKEY: int = 0x0001
-  user32: ctypes.WinDLL = ctypes.WinDLL("user32", use_last_error=True)
+  MOUSEEVENTF_MOVE: int = 0x0001
+  MOUSEEVENTF_ABSOLUTE: int = 0x8000
+  MOUSEEVENTF_WHEEL: int = 0x0800
+  MOUSEEVENTF_HWHEEL: int = 0x1000
+  MAX_BATCH: int = 1024  # Most INPUT records per SendInput, sizes the buffer
+  backend: Any = None  # InputBackend, Win32Backend is loaded on first use
+  rate_limiter: Any = None  # RateLimiter, None sends as fast as possible
+  metrics: Any = None  # Metrics, None skips all instrumentation
 
   # Reference: https://msdn.microsoft.com/en-us/library/dd375731
   # Each key value is 4 chars long and formatted in hexadecimal
@@ -193,17 +239,17 @@ class Keyboard:
     "x": 0x58,
     "y": 0x59,
     "z": 0x5A,
-    "=": 0x6B,
+    "=": 0xBB,
     " ": 0x20,
     ".": 0xBE,
     ",": 0xBC,
-    "-": 0x6D,
+    "-": 0xBD,
     "`": 0xC0,
     "/": 0xBF,
     ";": 0xBA,
     "[": 0xDB,
     "]": 0xDD,
-    "_": 0x6D,   # Shift
+    "_": 0xBD,   # Shift
     "|": 0xDC,   # Shift
     "~": 0xC0,   # Shift
     "?": 0xBF,   # Shift
@@ -222,12 +268,76 @@ class Keyboard:
     "*": 0x38,   # Shift
     "(": 0x39,   # Shift
     ")": 0x30,   # Shift
-    "+": 0x6B,   # Shift
+    "+": 0xBB,   # Shift
     "\"": 0xDE,  # Shift
     "\'": 0xDE,
     "\\": 0xDC,
     "\n": 0x0D
   }
+  # Mouse VK -> (MOUSEEVENTF_*DOWN, MOUSEEVENTF_*UP, mouseData)
+  mouse_buttons: dict[int, tuple[int, int, int]] = {
+    0x01: (0x0002, 0x0004, 0),  # Left
+    0x02: (0x0008, 0x0010, 0),  # Right
+    0x04: (0x0020, 0x0040, 0),  # Middle
+    0x05: (0x0080, 0x0100, 1),  # XBUTTON1
+    0x06: (0x0080, 0x0100, 2)   # XBUTTON2
+  }
+  mouse_vks: frozenset[int] = frozenset(mouse_buttons)
+
+  class KeyHandle(NamedTuple):
+    """
+    A key that has already been validated, returned by Keyboard.resolve
+    and accepted by every press/release function without checking again
+    """
+    name: str
+    vk: int
+    shift: bool = False
+
+  class KeyIndex:
+    """
+    Frozen lookups over vk_codes, built once when the module loads
+
+    Attributes:
+      vk_of: Key name -> VK
+      name_of: VK -> canonical name (the first unshifted name listed)
+      shifted: Names that need shift held to be typed
+      handles: Key name or VK -> KeyHandle
+      chars: Typeable characters, uppercase letters included -> KeyHandle
+    """
+
+    def __init__(
+        this: Self,
+        vk_codes: dict[str, int],
+        shifted: str,
+        handle: type
+    ) -> None:
+      name_of: dict[int, str] = {}
+      for name, vk in vk_codes.items():
+        if name not in shifted:
+          name_of.setdefault(vk, name)
+      for name, vk in vk_codes.items():
+        name_of.setdefault(vk, name)
+
+      handles: dict[str | int, Any] = {}
+      for name, vk in vk_codes.items():
+        handles[name] = handle(name, vk, name in shifted)
+      for vk, name in name_of.items():
+        handles[vk] = handle(name, vk, False)
+
+      chars: dict[str, Any] = {}
+      for name, vk in vk_codes.items():
+        if len(name) == 1:
+          chars[name] = handles[name]
+          if name.isalpha():
+            chars[name.upper()] = handle(name, vk, True)
+
+      this.vk_of: MappingProxyType = MappingProxyType(dict(vk_codes))
+      this.name_of: MappingProxyType = MappingProxyType(name_of)
+      this.shifted: frozenset[str] = frozenset(shifted)
+      this.handles: MappingProxyType = MappingProxyType(handles)
+      this.chars: MappingProxyType = MappingProxyType(chars)
+
+  index: KeyIndex = KeyIndex(vk_codes, "|~?:{}\"!@#$%^&*()_+<>", KeyHandle)
 
   # C struct declarations, recently added type hinting
   wintypes.ULONG_PTR: type[wintypes.WPARAM] = wintypes.WPARAM  # type: ignore
@@ -273,9 +383,7 @@ class Keyboard:
       # *args & **kwds are confusing asf: https://youtu.be/4jBJhCaNrWU
       super(KEYBDINPUT, this).__init__(*args, **kwds)
       if not this.dwFlags & Keyboard.KEYEVENTF_UNICODE:
-        this.wScan: Any = Keyboard.user32.MapVirtualKeyExW(
-          this.wVk, Keyboard.MAPVK_VK_TO_VSC, 0
-        )
+        this.wScan: int = Keyboard.scan_codes.lookup(this.wVk)
 
   class INPUT(ctypes.Structure):
 
@@ -293,6 +401,100 @@ class Keyboard:
 
   LPINPUT: Any = ctypes.POINTER(INPUT)
 
+  # Reused by every send, records are never built or allocated per event
+  _records: dict[tuple[int, int], bytes] = {}
+  _mouse_records: dict[tuple[int, int, int, int], bytes] = {}
+  _unicode_records: dict[int, bytes] = {}
+  _buffer: Any = (INPUT * MAX_BATCH)()
+  _buffer_view: memoryview = memoryview(_buffer).cast("B")
+  _buffer_lock: threading.Lock = threading.Lock()
+
+  class ScanCodeTable:
+    """
+    A 256 entry VK to scan code table, built once per keyboard layout
+
+    Functions:
+      build(layout): Maps every VK of the given layout in one pass
+      refresh(): Swaps tables if the active layout changed, returns True if so
+      lookup(vk): Returns the scan code of a VK for the active layout
+    """
+
+    def __init__(
+        this: Self,
+        map_vk: Any = None,
+        get_layout: Any = None,
+        check_interval: float = 1.0,
+        clock: Any = time.monotonic
+    ) -> None:
+      # Both callables can be swapped out to fake a layout off Windows
+      this.map_vk: Any = map_vk or (
+        lambda vk, layout: Keyboard.getBackend().mapVirtualKey(vk, layout)
+      )
+      this.get_layout: Any = get_layout or (
+        lambda: Keyboard.getBackend().keyboardLayout()
+      )
+      this.check_interval: float = check_interval
+      this.clock: Any = clock
+      this.tables: dict[Any, array] = {}
+      this.layout: Any = None
+      this.codes: array | None = None
+      this.checked: float = 0.0
+
+    def build(this: Self, layout: Any) -> array:
+      """
+      Maps every VK of the given layout in one pass
+
+      Args:
+        layout (Any): The layout handle passed to the mapping function
+
+      Returns:
+        array: 256 unsigned shorts indexed by VK
+      """
+      table: array = array("H", bytes(512))
+      for vk in range(256):
+        table[vk] = this.map_vk(vk, layout) & 0xFFFF
+      this.tables[layout] = table
+      return table
+
+    def refresh(this: Self, force: bool = False) -> bool:
+      """
+      Swaps tables if the active layout changed, the layout itself is only
+      queried once every check_interval seconds unless forced
+
+      Returns:
+        bool: True if the active table was replaced
+      """
+      now: float = this.clock()
+      if not force and this.codes is not None \
+          and now - this.checked < this.check_interval:
+        return False
+      this.checked: float = now
+
+      layout: Any = this.get_layout()
+      if this.codes is not None and layout == this.layout:
+        return False
+      this.layout: Any = layout
+      this.codes: array = this.tables.get(layout) or this.build(layout)
+      return True
+
+    def lookup(this: Self, vk: int) -> int:
+      """
+      Returns the scan code of a VK for the active layout
+      """
+      if this.codes is None:
+        this.refresh(force=True)
+      return this.codes[vk & 0xFF]
+
+    def reset(this: Self) -> None:
+      """
+      Drops every table, the next lookup maps the active layout again
+      """
+      this.tables.clear()
+      this.layout: Any = None
+      this.codes: array | None = None
+
+  scan_codes: ScanCodeTable = ScanCodeTable()
+
   # Helpers / Bare-bones implementation
 
   @staticmethod
@@ -301,6 +503,97 @@ class Keyboard:
       raise ctypes.WinError(ctypes.get_last_error())
     return args
 
+  @staticmethod
+  def _keyRecord(key_code: int, flags: int = 0) -> bytes:
+    # Prebuilt INPUT records are packed into immutable bytes on first use
+    record: bytes | None = Keyboard._records.get((key_code, flags))
+    if record is None:
+      record: bytes = bytes(Keyboard.INPUT(
+        type=Keyboard.INPUT_KEYBOARD,
+        ki=KEYBDINPUT(wVk=key_code, dwFlags=flags)
+      ))
+      Keyboard._records[(key_code, flags)] = record
+    return record
+
+  @staticmethod
+  def _mouseRecord(dx: int, dy: int, flags: int, data: int = 0) -> bytes:
+    # Mouse records carry no scan codes, so they never go stale
+    key: tuple[int, int, int, int] = (dx, dy, flags, data)
+    record: bytes | None = Keyboard._mouse_records.get(key)
+    if record is None:
+      record: bytes = bytes(Keyboard.INPUT(
+        type=Keyboard.INPUT_MOUSE,
+        mi=MOUSEINPUT(dx=dx, dy=dy, mouseData=data & 0xFFFFFFFF, dwFlags=flags)
+      ))
+      Keyboard._mouse_records[key] = record
+    return record
+
+  @staticmethod
+  def _unicodeRecords(unit: int) -> bytes:
+    # Down and up for one UTF-16 code unit, these never touch the layout
+    records: bytes | None = Keyboard._unicode_records.get(unit)
+    if records is None:
+      records: bytes = b"".join(
+        bytes(Keyboard.INPUT(
+          type=Keyboard.INPUT_KEYBOARD,
+          ki=KEYBDINPUT(wScan=unit, dwFlags=Keyboard.KEYEVENTF_UNICODE | flags)
+        )) for flags in (0, Keyboard.KEYEVENTF_KEYUP)
+      )
+      Keyboard._unicode_records[unit] = records
+    return records
+
+  @staticmethod
+  def _syncLayout() -> None:
+    # Cached records carry scan codes, so they go stale with the layout
+    if Keyboard.scan_codes.refresh():
+      Keyboard._records.clear()
+      Keyboard._compileMacro.cache_clear()
+
+  @staticmethod
+  def _sendRecords(records: list[bytes]) -> None:
+    Keyboard._sendData(b"".join(records))
+
+  @staticmethod
+  def _chunkEvents(chunk_size: int | None = None, atomic: bool = False) -> int:
+    # Most events one SendInput call may carry
+    events: int = min(chunk_size or Keyboard.MAX_BATCH, Keyboard.MAX_BATCH)
+    limiter: Keyboard.RateLimiter | None = Keyboard.rate_limiter
+    # Gestures go out whole, the limiter takes all their tokens in one wait
+    if limiter is not None and not atomic:
+      events: int = min(events, limiter.burst)
+    return events
+
+  @staticmethod
+  def _sendData(data: bytes, chunk_size: int | None = None, atomic: bool = False) -> None:
+    step: int = Keyboard._chunkEvents(chunk_size, atomic) * ctypes.sizeof(Keyboard.INPUT)
+    if len(data) <= step:
+      if data:
+        Keyboard._sendChunks((data,))
+    else:
+      Keyboard._sendChunks([data[start:start + step] for start in range(0, len(data), step)])
+
+  @staticmethod
+  def _sendChunks(chunks: Any) -> None:
+    # Every INPUT goes out through here, one SendInput per chunk of at most MAX_BATCH
+    backend: Keyboard.InputBackend = Keyboard.backend or Keyboard.getBackend()
+    size: int = ctypes.sizeof(Keyboard.INPUT)
+    limiter: Keyboard.RateLimiter | None = Keyboard.rate_limiter
+    metrics: Keyboard.Metrics | None = Keyboard.metrics
+    # Held across throttled waits too, nothing may land inside a stream
+    with Keyboard._buffer_lock:
+      for chunk in chunks:
+        if limiter is not None:
+          limiter.acquire(len(chunk) // size)
+        Keyboard._buffer_view[:len(chunk)] = chunk
+        if metrics is None:
+          backend.sendInput(len(chunk) // size, Keyboard._buffer, size)
+        else:
+          metrics.timeSend(backend, len(chunk) // size, size)
+
+  @staticmethod
+  def _sendInputs(inputs: list[Any]) -> None:
+    Keyboard._sendRecords([bytes(x) for x in inputs])
+
   @staticmethod
   def _lookup(key: Any) -> int | bool:
     if key in Keyboard.vk_codes:
@@ -310,13 +603,11 @@ class Keyboard:
 
   @staticmethod
   def mouseScroll(axis: str, dist: int, x: int = 0, y: int = 0) -> None | bool:
-    if axis == "v" or axis == "vertical":
-      win32api.mouse_event(MOUSEEVENTF_WHEEL, x, y, dist, 0)  # noqa: F405 MOUSEEVENTF_WHEEL is a windows thing
-    elif axis == "h" or axis == "horizontal":
-      win32api.mouse_event(MOUSEEVENTF_HWHEEL, x, y, dist,
-                           0)  # noqa: F405 MOUSEEVENTF_HWHEEL is a windows thing as well
-    else:
+    # x and y were only ever ignored by mouse_event without MOUSEEVENTF_MOVE
+    flags: int | None = Keyboard.Scroller.axes.get(axis)
+    if flags is None:
       return False
+    Keyboard._sendData(Keyboard._mouseRecord(0, 0, flags, dist))
 
   class ManipulateMouse:
     """
@@ -332,57 +623,1431 @@ class Keyboard:
       """
       Retrieve the current position of the mouse cursor.
       """
-
-      # Define the POINT structure to store cursor position
-      class POINT(ctypes.Structure):
-        _fields_: list = [("x", ctypes.c_long), ("y", ctypes.c_long)]
-
-      point: POINT = POINT()
-      ctypes.windll.user32.GetCursorPos(ctypes.byref(point))
-      return (point.x, point.y)
+      return Keyboard.getBackend().getCursorPos()
 
     @staticmethod
     def setPosition(x: int, y: int) -> None:
       """
       Set the position of the mouse cursor to the given coordinates.
       """
-      ctypes.windll.user32.SetCursorPos(x, y)
+      Keyboard.getBackend().setCursorPos(x, y)
+
+  class InputBackend:
+    """
+    Where every input ends up, swap it out with Keyboard.setBackend
+
+    Functions:
+      sendInput(count, inputs, size): Sends an INPUT array like SendInput
+      mapVirtualKey(vk, layout): Returns the scan code of a VK
+      keyboardLayout(): Returns the active keyboard layout handle
+      getKeyState(vk): Returns the raw GetKeyState value of a VK
+      getKeyboardState(buffer): Fills 256 bytes with every key's state
+      getCursorPos(): Returns the cursor's position
+      setCursorPos(x, y): Moves the cursor
+      screenSize(): Returns the primary screen's width and height
+      doubleClickTime(): Returns the double-click time in milliseconds
+      hookInput(on_key, on_mouse): Reports real input until the returned
+        function is called
+    """
+
+    def sendInput(this: Self, count: int, inputs: Any, size: int) -> int:
+      raise NotImplementedError
+
+    def mapVirtualKey(this: Self, vk: int, layout: Any) -> int:
+      raise NotImplementedError
+
+    def keyboardLayout(this: Self) -> Any:
+      raise NotImplementedError
+
+    def getKeyState(this: Self, vk: int) -> int:
+      raise NotImplementedError
+
+    def getKeyboardState(this: Self, buffer: Any) -> None:
+      raise NotImplementedError
+
+    def getCursorPos(this: Self) -> tuple[int, int]:
+      raise NotImplementedError
+
+    def setCursorPos(this: Self, x: int, y: int) -> None:
+      raise NotImplementedError
+
+    def screenSize(this: Self) -> tuple[int, int]:
+      raise NotImplementedError
+
+    def doubleClickTime(this: Self) -> int:
+      raise NotImplementedError
+
+    def hookInput(this: Self, on_key: Any, on_mouse: Any) -> Any:
+      raise NotImplementedError
+
+  class Win32Backend(InputBackend):
+    """
+    Sends everything through user32, which is only loaded on first use
+    """
+
+    def __init__(this: Self) -> None:
+      this._user32: Any = None
+      this._point: Any = None
+
+    @property
+    def user32(this: Self) -> Any:
+      if this._user32 is None:
+        user32: Any = ctypes.WinDLL("user32", use_last_error=True)
+        user32.GetKeyboardLayout.restype = wintypes.HKL
+        user32.GetForegroundWindow.restype = wintypes.HWND
+        user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, wintypes.LPDWORD)
+        user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+        user32.MapVirtualKeyExW.argtypes = (
+          wintypes.UINT, wintypes.UINT, wintypes.HKL
+        )
+        # Type annotation not supported
+        user32.SendInput.errcheck = Keyboard._checkCount
+        user32.SendInput.argtypes = (
+          wintypes.UINT,     # nInputs
+          Keyboard.LPINPUT,  # pInputs
+          ctypes.c_int       # cbSize
+        )
+        this._point: wintypes.POINT = wintypes.POINT()
+        this._user32: Any = user32
+      return this._user32
+
+    def sendInput(this: Self, count: int, inputs: Any, size: int) -> int:
+      return this.user32.SendInput(count, inputs, size)
+
+    def mapVirtualKey(this: Self, vk: int, layout: Any) -> int:
+      return this.user32.MapVirtualKeyExW(vk, Keyboard.MAPVK_VK_TO_VSC, layout)
+
+    def keyboardLayout(this: Self) -> Any:
+      # Input lands in the foreground window, so its thread's layout is the
+      # one that counts, ours never follows the user switching layouts. With
+      # no foreground window (secure desktop) the thread id is 0, ours again
+      user32: Any = this.user32
+      thread: int = user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), None)
+      return user32.GetKeyboardLayout(thread)
+
+    def getKeyState(this: Self, vk: int) -> int:
+      return this.user32.GetKeyState(vk)
+
+    def getKeyboardState(this: Self, buffer: Any) -> None:
+      user32: Any = this.user32
+      # GetKeyboardState only sees this thread's copy, GetKeyState syncs it
+      user32.GetKeyState(0)
+      if not user32.GetKeyboardState(buffer):
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    def getCursorPos(this: Self) -> tuple[int, int]:
+      user32: Any = this.user32
+      user32.GetCursorPos(ctypes.byref(this._point))
+      return (this._point.x, this._point.y)
+
+    def setCursorPos(this: Self, x: int, y: int) -> None:
+      this.user32.SetCursorPos(x, y)
+
+    def screenSize(this: Self) -> tuple[int, int]:
+      return (this.user32.GetSystemMetrics(0), this.user32.GetSystemMetrics(1))
+
+    def doubleClickTime(this: Self) -> int:
+      return this.user32.GetDoubleClickTime()
+
+    def hookInput(this: Self, on_key: Any, on_mouse: Any) -> Any:
+      # Low-level hooks only fire while the thread that installed them is
+      # pumping messages, so they get a thread of their own
+      user32: Any = this.user32
+      kernel32: Any = ctypes.WinDLL("kernel32", use_last_error=True)
+      kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+      HOOKPROC: Any = ctypes.WINFUNCTYPE(
+        wintypes.LPARAM, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
+      )
+      user32.SetWindowsHookExW.argtypes = (
+        ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD
+      )
+      user32.SetWindowsHookExW.restype = wintypes.HHOOK
+      user32.CallNextHookEx.argtypes = (
+        wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM
+      )
+      user32.CallNextHookEx.restype = wintypes.LPARAM
+
+      class KBDLLHOOKSTRUCT(ctypes.Structure):
+        _fields_: tuple[tuple[str, Any], ...] = (
+          ("vkCode", wintypes.DWORD),
+          ("scanCode", wintypes.DWORD),
+          ("flags", wintypes.DWORD),
+          ("time", wintypes.DWORD),
+          ("dwExtraInfo", wintypes.ULONG_PTR)
+        )
+
+      class MSLLHOOKSTRUCT(ctypes.Structure):
+        _fields_: tuple[tuple[str, Any], ...] = (
+          ("pt", wintypes.POINT),
+          ("mouseData", wintypes.DWORD),
+          ("flags", wintypes.DWORD),
+          ("time", wintypes.DWORD),
+          ("dwExtraInfo", wintypes.ULONG_PTR)
+        )
+
+      def key_proc(code: int, message: int, event: int) -> int:
+        if code == 0:
+          info: Any = KBDLLHOOKSTRUCT.from_address(event)
+          on_key(message, info.vkCode, info.scanCode, info.flags)
+        return user32.CallNextHookEx(None, code, message, event)
+
+      def mouse_proc(code: int, message: int, event: int) -> int:
+        if code == 0:
+          info: Any = MSLLHOOKSTRUCT.from_address(event)
+          on_mouse(message, info.mouseData, info.flags)
+        return user32.CallNextHookEx(None, code, message, event)
+
+      # The callbacks have to outlive the hooks or Windows calls freed memory
+      procs: tuple[Any, Any] = (HOOKPROC(key_proc), HOOKPROC(mouse_proc))
+      ready: threading.Event = threading.Event()
+      thread_id: list[int] = []
+
+      def pump() -> None:
+        module: Any = kernel32.GetModuleHandleW(None)
+        hooks: list[Any] = [
+          user32.SetWindowsHookExW(Keyboard.WH_KEYBOARD_LL, procs[0], module, 0),
+          user32.SetWindowsHookExW(Keyboard.WH_MOUSE_LL, procs[1], module, 0)
+        ]
+        thread_id.append(kernel32.GetCurrentThreadId())
+        ready.set()
+        message: wintypes.MSG = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(message), None, 0, 0) > 0:
+          user32.DispatchMessageW(ctypes.byref(message))
+        for hook in hooks:
+          if hook:
+            user32.UnhookWindowsHookEx(hook)
+
+      thread: threading.Thread = threading.Thread(target=pump, daemon=True)
+      thread.start()
+      ready.wait()
+
+      def stop() -> None:
+        user32.PostThreadMessageW(thread_id[0], Keyboard.WM_QUIT, 0, 0)
+        thread.join()
+      return stop
+
+  class NullBackend(InputBackend):
+    """
+    Accepts and counts everything without sending it anywhere, meant for
+    benchmarks and for running off Windows
+    """
+
+    def __init__(this: Self) -> None:
+      this.calls: int = 0
+      this.sent: int = 0
+      this.cursor: tuple[int, int] = (0, 0)
+      this.screen: tuple[int, int] = (1920, 1080)
+      this.hooks: tuple[Any, Any] | None = None
+
+    def sendInput(this: Self, count: int, inputs: Any, size: int) -> int:
+      this.calls += 1
+      this.sent += count
+      return count
+
+    def mapVirtualKey(this: Self, vk: int, layout: Any) -> int:
+      return 0
+
+    def keyboardLayout(this: Self) -> Any:
+      return 0
+
+    def getKeyState(this: Self, vk: int) -> int:
+      return 0
+
+    def getKeyboardState(this: Self, buffer: Any) -> None:
+      ctypes.memset(buffer, 0, 256)
+
+    def getCursorPos(this: Self) -> tuple[int, int]:
+      return this.cursor
+
+    def setCursorPos(this: Self, x: int, y: int) -> None:
+      this.cursor: tuple[int, int] = (x, y)
+
+    def screenSize(this: Self) -> tuple[int, int]:
+      return this.screen
+
+    def doubleClickTime(this: Self) -> int:
+      return 500  # The Windows default
+
+    def hookInput(this: Self, on_key: Any, on_mouse: Any) -> Any:
+      # Nothing real to hook, callers feed synthetic events through hooks
+      this.hooks: tuple[Any, Any] | None = (on_key, on_mouse)
+
+      def stop() -> None:
+        this.hooks: tuple[Any, Any] | None = None
+      return stop
+
+  class RecordingBackend(NullBackend):
+    """
+    Keeps a copy of every INPUT record it is given instead of sending it
+
+    Functions:
+      keys(): Returns (vk, flags) pairs for every recorded keyboard event
+      clear(): Forgets everything recorded so far
+    """
+
+    def __init__(this: Self) -> None:
+      super().__init__()
+      this.events: list[Any] = []
+      this.down: set[int] = set()
+
+    def sendInput(this: Self, count: int, inputs: Any, size: int) -> int:
+      for i in range(count):
+        event: Keyboard.INPUT = Keyboard.INPUT.from_buffer_copy(inputs[i])
+        if event.type == Keyboard.INPUT_KEYBOARD:
+          if event.ki.dwFlags & Keyboard.KEYEVENTF_KEYUP:
+            this.down.discard(event.ki.wVk)
+          else:
+            this.down.add(event.ki.wVk)
+        elif event.mi.dwFlags & Keyboard.MOUSEEVENTF_ABSOLUTE:
+          this.cursor: tuple[int, int] = Keyboard.Motion.fromAbsolute(
+            event.mi.dx, event.mi.dy, this.screen
+          )
+        this.events.append(event)
+      return super().sendInput(count, inputs, size)
+
+    def getKeyState(this: Self, vk: int) -> int:
+      return 0x8000 if vk in this.down else 0
+
+    def getKeyboardState(this: Self, buffer: Any) -> None:
+      ctypes.memset(buffer, 0, 256)
+      for vk in this.down:
+        buffer[vk & 0xFF] = 0x80
+
+    def keys(this: Self) -> list[tuple[int, int]]:
+      """
+      Returns (vk, flags) pairs for every recorded keyboard event
+      """
+      return [
+        (event.ki.wVk, event.ki.dwFlags) for event in this.events
+        if event.type == Keyboard.INPUT_KEYBOARD
+      ]
+
+    def clear(this: Self) -> None:
+      """
+      Forgets everything recorded so far
+      """
+      this.calls: int = 0
+      this.sent: int = 0
+      this.events.clear()
+      this.down.clear()
+
+  class Motion:
+    """
+    Cursor paths as plain lists of points, plus the one pass that turns
+    them into absolute move records for SendInput
+
+    Functions:
+      linear(start, end, steps, ease): Straight line
+      bezier(start, end, steps, controls, ease): Cubic Bezier curve
+      easeInOut(t): Slow start and finish, for the ease argument
+      toRecords(points, screen): Packs points as absolute move INPUTs
+      fromAbsolute(dx, dy, screen): Turns 0-65535 coordinates into pixels
+    """
+    # dx and dy are adjacent LONGs in the MOUSEINPUT inside INPUT, native
+    # "l" has the same width as ctypes' c_long on every platform
+    _dxdy: struct.Struct = struct.Struct("ll")
+
+    @staticmethod
+    def easeInOut(t: float) -> float:
+      return t * t * (3 - 2 * t)
+
+    @staticmethod
+    def linear(
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int,
+        ease: Any = None
+    ) -> list[tuple[int, int]]:
+      (x0, y0), (x1, y1) = start, end
+      points: list[tuple[int, int]] = []
+      for i in range(1, steps + 1):
+        t: float = ease(i / steps) if ease else i / steps
+        points.append((round(x0 + (x1 - x0) * t), round(y0 + (y1 - y0) * t)))
+      return points
 
-  # Type annotation not supported
-  user32.SendInput.errcheck = _checkCount
-  user32.SendInput.argtypes = (
-    wintypes.UINT,  # nInputs
-    LPINPUT,        # pInputs
-    ctypes.c_int    # cbSize
-  )
+    @staticmethod
+    def bezier(
+        start: tuple[int, int],
+        end: tuple[int, int],
+        steps: int,
+        controls: tuple[tuple[int, int], tuple[int, int]] | None = None,
+        ease: Any = None
+    ) -> list[tuple[int, int]]:
+      (x0, y0), (x3, y3) = start, end
+      if controls is None:
+        # A gentle arc, a quarter of the distance off the straight line
+        nx, ny = (y0 - y3) / 4, (x3 - x0) / 4
+        controls = (
+          (x0 + (x3 - x0) / 3 + nx, y0 + (y3 - y0) / 3 + ny),
+          (x0 + 2 * (x3 - x0) / 3 + nx, y0 + 2 * (y3 - y0) / 3 + ny)
+        )
+      (x1, y1), (x2, y2) = controls
+      points: list[tuple[int, int]] = []
+      for i in range(1, steps + 1):
+        t: float = ease(i / steps) if ease else i / steps
+        u: float = 1 - t
+        a, b, c, d = u * u * u, 3 * u * u * t, 3 * u * t * t, t * t * t
+        points.append((
+          round(a * x0 + b * x1 + c * x2 + d * x3),
+          round(a * y0 + b * y1 + c * y2 + d * y3)
+        ))
+      return points
+
+    @staticmethod
+    def toRecords(points: list[tuple[int, int]], screen: tuple[int, int]) -> bytes:
+      """
+      Packs every point as an absolute move INPUT in one pass
+
+      Returns:
+        bytes: len(points) packed INPUT records
+      """
+      template: bytes = Keyboard._mouseRecord(
+        0, 0, Keyboard.MOUSEEVENTF_MOVE | Keyboard.MOUSEEVENTF_ABSOLUTE
+      )
+      size: int = len(template)
+      offset: int = Keyboard.INPUT._input.offset + MOUSEINPUT.dx.offset
+      scale_x: float = 65535 / max(screen[0] - 1, 1)
+      scale_y: float = 65535 / max(screen[1] - 1, 1)
+      data: bytearray = bytearray(template * len(points))
+      pack: Any = Keyboard.Motion._dxdy.pack_into
+      for i, (x, y) in enumerate(points):
+        pack(data, i * size + offset, round(x * scale_x), round(y * scale_y))
+      return bytes(data)
+
+    @staticmethod
+    def fromAbsolute(dx: int, dy: int, screen: tuple[int, int]) -> tuple[int, int]:
+      return (
+        round(dx * max(screen[0] - 1, 1) / 65535),
+        round(dy * max(screen[1] - 1, 1) / 65535)
+      )
+
+  class Scroller:
+    """
+    Queues wheel movement and merges consecutive deltas on the same axis
+    that arrive within a short window, so a loop scrolling one notch at a
+    time costs one wheel event instead of one SendInput per notch. With
+    autoflush a timer sends whatever is queued once the window runs out,
+    without it nothing goes out until flush() or the end of a with block
+
+    Functions:
+      scroll(axis, dist): Queues a delta, flushing first if the window ran out
+      flush(): Sends everything queued as one batch
+    """
+    axes: dict[str, int] = {
+      "v": 0x0800, "vertical": 0x0800,    # MOUSEEVENTF_WHEEL
+      "h": 0x1000, "horizontal": 0x1000   # MOUSEEVENTF_HWHEEL
+    }
+
+    def __init__(
+        this: Self,
+        window: float = 0.05,
+        clock: Any = time.monotonic,
+        autoflush: bool = True,
+        timer: Any = threading.Timer
+    ) -> None:
+      this.window: float = window
+      this.clock: Any = clock
+      this.autoflush: bool = autoflush
+      this.timer_type: Any = timer
+      this.timer: Any = None
+      # The timer flushes from its own thread
+      this.lock: threading.Lock = threading.Lock()
+      this.pending: list[list[int]] = []
+      this.opened: float = 0.0
+      this.last: float = 0.0
+
+    def scroll(this: Self, axis: str, dist: int) -> None:
+      flags: int | None = Keyboard.Scroller.axes.get(axis)
+      if flags is None:
+        Keyboard.error(error_type="r", runtime_error="given axis is not valid")
+        return Keyboard.exit_code
+      with this.lock:
+        now: float = this.clock()
+        if this.pending and now - this.opened > this.window:
+          this._flush()
+        if not this.pending:
+          this.opened: float = now
+          if this.autoflush:
+            this.timer = this.timer_type(this.window, this._expire, (now,))
+            this.timer.start()
+        if this.pending and this.pending[-1][0] == flags and now - this.last <= this.window:
+          this.pending[-1][1] += dist
+        else:
+          this.pending.append([flags, dist])
+        this.last: float = now
+
+    def flush(this: Self) -> None:
+      with this.lock:
+        this._flush()
+
+    def _expire(this: Self, opened: float) -> None:
+      # A timer that lost the race to a flush must leave the next window alone
+      with this.lock:
+        if this.pending and this.opened == opened:
+          this._flush()
+
+    def _flush(this: Self) -> None:
+      if this.timer is not None:
+        this.timer.cancel()
+        this.timer = None
+      records: list[bytes] = [
+        Keyboard._mouseRecord(0, 0, flags, dist)
+        for flags, dist in this.pending if dist
+      ]
+      this.pending.clear()
+      if records:
+        Keyboard._sendRecords(records)
+
+    def __enter__(this: Self) -> Self:
+      return this
+
+    def __exit__(this: Self, *exc: Any) -> None:
+      this.flush()
+
+  class RateLimiter:
+    """
+    Token bucket in front of SendInput, streams are split into chunks of
+    at most burst events and the sender sleeps between them whenever the
+    events per second ceiling would be passed
+
+    Functions:
+      acquire(count): Takes count tokens, sleeping first if there are none
+      throughput(): Returns the events per second achieved so far
+      reset(): Zeroes the counters
+    """
+
+    def __init__(
+        this: Self,
+        rate: float,
+        burst: int | None = None,
+        clock: Any = time.monotonic,
+        sleep: Any = time.sleep
+    ) -> None:
+      this.rate: float = rate
+      # A tenth of a second worth of events unless told otherwise
+      this.burst: int = burst or max(1, int(rate / 10))
+      this.clock: Any = clock
+      this.sleep: Any = sleep
+      this.tokens: float = float(this.burst)
+      this.updated: float = clock()
+      this.reset()
+
+    def reset(this: Self) -> None:
+      this.events: int = 0
+      this.throttled: float = 0.0
+      this.started: float | None = None
+
+    def acquire(this: Self, count: int) -> None:
+      now: float = this.clock()
+      if this.started is None:
+        this.started: float = now
+      this.tokens: float = min(
+        float(this.burst), this.tokens + (now - this.updated) * this.rate
+      )
+      this.updated: float = now
+      # Going into debt is allowed, the wait pays it back
+      this.tokens -= count
+      if this.tokens < 0:
+        wait: float = -this.tokens / this.rate
+        this.sleep(wait)
+        this.throttled += wait
+      this.events += count
+
+    def throughput(this: Self) -> float:
+      if this.started is None:
+        return 0.0
+      elapsed: float = this.clock() - this.started
+      return this.events / elapsed if elapsed > 0 else float(this.events)
+
+  @staticmethod
+  def setRateLimit(events_per_second: float | None, burst: int | None = None) -> Any:
+    """
+    Caps how fast INPUT events are handed to the backend
+
+    Args:
+      events_per_second (float | None): The ceiling, None removes it
+      burst (int, optional): Most events sent back to back, also the chunk
+      size, defaults to a tenth of a second worth. Clicks, drags and
+      nudges are never split, they wait for all their tokens at once
+
+    Returns:
+      RateLimiter: The new limiter, read its events, throttled and
+      throughput() to tune the ceiling
+    """
+    if events_per_second is None:
+      Keyboard.rate_limiter = None
+      return None
+    # bool is an int too, but True is no rate
+    if not isinstance(events_per_second, int | float) or isinstance(events_per_second, bool) \
+        or events_per_second <= 0:
+      Keyboard.error(
+        error_type="p", var="events_per_second", type="positive number")
+      return Keyboard.exit_code
+    if burst is not None and (not isinstance(burst, int) or isinstance(burst, bool) or burst < 1):
+      Keyboard.error(error_type="p", var="burst", type="positive integer")
+      return Keyboard.exit_code
+    Keyboard.rate_limiter = Keyboard.RateLimiter(events_per_second, burst)
+    return Keyboard.rate_limiter
+
+  class Histogram:
+    """
+    Counts samples in log2 buckets of microseconds, bucket i holds what
+    took more than 2^(i-1) and at most 2^i us, so a sample on a bound
+    counts under it like Prometheus' le and observing is a bit_length
+
+    Functions:
+      observe(seconds): Adds a sample
+      bounds(): Returns every bucket's upper bound in seconds
+    """
+    SIZE: int = 32  # The last bound is about 36 minutes
+
+    def __init__(this: Self) -> None:
+      this.buckets: list[int] = [0] * Keyboard.Histogram.SIZE
+      this.overflow: int = 0  # Past the last bound, only counted in +Inf
+      this.count: int = 0
+      this.sum: float = 0.0
+
+    def observe(this: Self, seconds: float) -> None:
+      seconds: float = max(seconds, 0.0)
+      # Whole nanoseconds first so bounds are hit exactly, then ceil to us
+      micros: int = -(-round(seconds * 1e9) // 1000)
+      index: int = (max(micros, 1) - 1).bit_length()
+      if index < Keyboard.Histogram.SIZE:
+        this.buckets[index] += 1
+      else:
+        this.overflow += 1
+      this.count += 1
+      this.sum += seconds
+
+    @staticmethod
+    def bounds() -> list[float]:
+      return [2 ** i / 1e6 for i in range(Keyboard.Histogram.SIZE)]
+
+  class Metrics:
+    """
+    Counters and latency histograms for everything sent, collected only
+    while enabled with Keyboard.enableMetrics
+
+    Functions:
+      timeSend(backend, count, size): Times one SendInput call
+      observe(name, seconds): Adds a sample to a named histogram
+      fail(kind, message): Counts a failure, keeping its message
+      toDict(): Returns everything as plain data
+      toPrometheus(): Returns the Prometheus text format
+      export(path): Writes JSON to .json paths, Prometheus text otherwise
+    """
+
+    def __init__(this: Self) -> None:
+      this.calls: int = 0
+      this.events: int = 0
+      this.failures: dict[str, int] = {}
+      this.errors: deque[str] = deque(maxlen=32)
+      this.histograms: dict[str, Keyboard.Histogram] = {
+        "sendinput_seconds": Keyboard.Histogram()
+      }
+
+    def timeSend(this: Self, backend: Any, count: int, size: int) -> None:
+      start: int = time.perf_counter_ns()
+      try:
+        backend.sendInput(count, Keyboard._buffer, size)
+      except OSError as e:
+        this.fail("sendinput", str(e))
+        raise
+      this.histograms["sendinput_seconds"].observe(
+        (time.perf_counter_ns() - start) / 1e9)
+      this.calls += 1
+      this.events += count
+
+    def observe(this: Self, name: str, seconds: float) -> None:
+      histogram: Keyboard.Histogram | None = this.histograms.get(name)
+      if histogram is None:
+        histogram: Keyboard.Histogram = Keyboard.Histogram()
+        this.histograms[name] = histogram
+      histogram.observe(seconds)
+
+    def fail(this: Self, kind: str, message: str = "") -> None:
+      this.failures[kind] = this.failures.get(kind, 0) + 1
+      if message:
+        this.errors.append(message)
+
+    def toDict(this: Self) -> dict[str, Any]:
+      return {
+        "sendinput_calls": this.calls,
+        "sendinput_events": this.events,
+        "failures": dict(this.failures),
+        "errors": list(this.errors),
+        "histograms": {
+          name: {
+            "bounds": Keyboard.Histogram.bounds(),
+            "buckets": list(histogram.buckets),
+            "overflow": histogram.overflow,
+            "count": histogram.count,
+            "sum": histogram.sum
+          } for name, histogram in this.histograms.items()
+        }
+      }
+
+    def toPrometheus(this: Self, prefix: str = "keyboard_cat") -> str:
+      lines: list[str] = [
+        f"# TYPE {prefix}_sendinput_calls_total counter",
+        f"{prefix}_sendinput_calls_total {this.calls}",
+        f"# TYPE {prefix}_sendinput_events_total counter",
+        f"{prefix}_sendinput_events_total {this.events}",
+        f"# TYPE {prefix}_failures_total counter"
+      ]
+      for kind, count in sorted(this.failures.items()):
+        lines.append(f'{prefix}_failures_total{{kind="{kind}"}} {count}')
+      for name, histogram in sorted(this.histograms.items()):
+        lines.append(f"# TYPE {prefix}_{name} histogram")
+        # Prometheus buckets are cumulative
+        total: int = 0
+        for bound, count in zip(Keyboard.Histogram.bounds(), histogram.buckets):
+          total += count
+          lines.append(f'{prefix}_{name}_bucket{{le="{bound!r}"}} {total}')
+        lines.append(f'{prefix}_{name}_bucket{{le="+Inf"}} {histogram.count}')
+        lines.append(f"{prefix}_{name}_sum {histogram.sum:.9g}")
+        lines.append(f"{prefix}_{name}_count {histogram.count}")
+      return "\n".join(lines) + "\n"
+
+    def export(this: Self, path: str) -> None:
+      if path.endswith(".json"):
+        text: str = json.dumps(this.toDict(), indent=2)
+      else:
+        text: str = this.toPrometheus()
+      # Textfile collectors may read at any time, so swap the file in whole
+      with open(path + ".tmp", "w", encoding="utf-8") as file:
+        file.write(text)
+      os.replace(path + ".tmp", path)
+
+  @staticmethod
+  def enableMetrics(enabled: bool = True) -> Any:
+    """
+    Turns instrumentation on or off, while off the only cost left on the
+    send path is reading Keyboard.metrics once per call
+
+    Args:
+      enabled (bool, optional): False drops everything collected so far
+
+    Returns:
+      Metrics: The new collector, None when disabled
+    """
+    if not isinstance(enabled, bool):
+      Keyboard.error(error_type="p", var="enabled", type="boolean")
+      return Keyboard.exit_code
+    Keyboard.metrics = Keyboard.Metrics() if enabled else None
+    return Keyboard.metrics
+
+  class KeyStateSnapshot:
+    """
+    Every key's state from a single GetKeyboardState call into a reused
+    buffer, query it as often as needed without going back to user32
+
+    Functions:
+      refresh(): Reads all 256 key states again
+      isDown(key): Returns True if the key is held
+      isToggled(key): Returns True if the key is toggled on (caps etc.)
+      downKeys(): Returns the VKs of every held key
+      anyDown(keys): Returns True if any of the keys (or mask) is held
+      anyModifier(): Returns True if shift, ctrl, alt or win is held
+    """
+    modifier_vks: tuple[int, ...] = (
+      0x10, 0x11, 0x12, 0x5B, 0x5C, 0xA0, 0xA1, 0xA2, 0xA3, 0xA4, 0xA5
+    )
+
+    def __init__(this: Self) -> None:
+      this.buffer: Any = (ctypes.c_ubyte * 256)()
+      this.mask: int = 0
+      this.modifier_mask: int = Keyboard.keyMask(this.modifier_vks)
+
+    def refresh(this: Self) -> Self:
+      Keyboard.getBackend().getKeyboardState(this.buffer)
+      mask: int = 0
+      for vk, state in enumerate(bytes(this.buffer)):
+        if state & 0x80:
+          mask |= 1 << vk
+      this.mask: int = mask
+      return this
+
+    def isDown(this: Self, key: str | int) -> bool:
+      vk: int | None = Keyboard._stateVk(key)
+      if vk is None:
+        return Keyboard.exit_code
+      return bool(this.mask >> vk & 1)
+
+    def isToggled(this: Self, key: str | int) -> bool:
+      vk: int | None = Keyboard._stateVk(key)
+      if vk is None:
+        return Keyboard.exit_code
+      return bool(this.buffer[vk] & 0x01)
+
+    def downKeys(this: Self) -> list[int]:
+      return [vk for vk in range(256) if this.mask >> vk & 1]
+
+    def anyDown(this: Self, keys: Any) -> bool:
+      # A mask from Keyboard.keyMask saves rebuilding it on every poll
+      mask: int | None = keys if isinstance(keys, int) else Keyboard.keyMask(keys)
+      if mask is None:
+        return Keyboard.exit_code
+      return bool(this.mask & mask)
+
+    def anyModifier(this: Self) -> bool:
+      return bool(this.mask & this.modifier_mask)
+
+  @staticmethod
+  def _stateVk(key: Any) -> int | None:
+    # Any VK is fine here, not just the ones in vk_codes, names have to be
+    if isinstance(key, int) and not isinstance(key, bool) and 0 <= key <= 0xFF:
+      return key
+    vk: int | None = Keyboard.index.vk_of.get(key) if isinstance(key, str) else None
+    if vk is None:
+      Keyboard.error(error_type="r", runtime_error="given key code is not valid")
+      return None
+    return vk & 0xFF
+
+  @staticmethod
+  def keyMask(keys: Any) -> int:
+    """
+    Returns a 256 bit mask with one bit set per key, for anyDown
+
+    Args:
+      keys (Iterable[str | int]): Key names or VKs
+
+    Returns:
+      int: The mask, None if any of the keys is not valid
+    """
+    mask: int = 0
+    for key in keys:
+      vk: int | None = Keyboard._stateVk(key)
+      if vk is None:
+        return Keyboard.exit_code
+      mask |= 1 << vk
+    return mask
+
+  @staticmethod
+  def snapshotKeys(snapshot: Any = None) -> Any:
+    """
+    Reads every key's state with one call
+
+    Args:
+      snapshot (KeyStateSnapshot, optional): Refreshed in place if given,
+      so polling loops never allocate
+
+    Returns:
+      KeyStateSnapshot: The refreshed snapshot
+    """
+    return (snapshot or Keyboard.KeyStateSnapshot()).refresh()
+
+  @staticmethod
+  def getBackend() -> Any:
+    """
+    Returns the active input backend, loading Win32Backend if none is set
+    """
+    if Keyboard.backend is None:
+      Keyboard.backend = Keyboard.Win32Backend()
+    return Keyboard.backend
+
+  @staticmethod
+  def setBackend(backend: Any) -> None:
+    """
+    Routes every input through the given backend
+
+    Args:
+      backend (InputBackend): The backend to use, None goes back to
+      Win32Backend on next use
+    """
+    if backend is not None and not isinstance(backend, Keyboard.InputBackend):
+      Keyboard.error(error_type="p", var="backend", type="InputBackend")
+      return Keyboard.exit_code
+    with Keyboard._buffer_lock:
+      Keyboard.backend = backend
+      # Scan codes and the records built from them belong to the backend
+      Keyboard.scan_codes.reset()
+      Keyboard._records.clear()
+      Keyboard._compileMacro.cache_clear()
+
+  class Raw:
+    """
+    Trusted low-level API for callers that validated their keys already,
+    it goes straight to the send path without any type or value checks
+
+    Functions:
+      press(vk): Presses a VK
+      release(vk): Releases a VK
+      tap(vk): Presses and releases a VK in one batch
+      send(records): Sends prebuilt INPUT records as they are
+    """
+
+    @staticmethod
+    def press(vk: int) -> None:
+      Keyboard._syncLayout()
+      Keyboard._sendRecords([Keyboard._keyRecord(vk)])
+
+    @staticmethod
+    def release(vk: int) -> None:
+      Keyboard._syncLayout()
+      Keyboard._sendRecords([
+        Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP)
+      ])
+
+    @staticmethod
+    def tap(vk: int) -> None:
+      Keyboard._syncLayout()
+      Keyboard._sendRecords([
+        Keyboard._keyRecord(vk),
+        Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP)
+      ])
+
+    @staticmethod
+    def send(records: list[bytes]) -> None:
+      Keyboard._sendRecords(records)
+
+  class ModifierState:
+    """
+    Tracks which of shift, ctrl, alt and win are down while compiling, so
+    a modifier event is only emitted when its state really changes
+
+    Functions:
+      isDown(vk): Returns True if the modifier is held
+      set(vk, down, records): Appends a transition if the state changes
+      restore(records): Releases every modifier still held
+      cleanup(): Release records for every modifier ever pressed
+    """
+    modifiers: frozenset[int] = frozenset({0x10, 0x11, 0x12, 0x5B})
+
+    def __init__(this: Self) -> None:
+      this.held: list[int] = []
+      this.used: set[int] = set()
+
+    def isDown(this: Self, vk: int) -> bool:
+      return vk in this.held
+
+    def set(this: Self, vk: int, down: bool, records: list[bytes]) -> bool:
+      """
+      Appends the record for a modifier transition, if there is one
+
+      Returns:
+        bool: True if a record was appended
+      """
+      if down == (vk in this.held):
+        return False
+      if down:
+        this.held.append(vk)
+        this.used.add(vk)
+        records.append(Keyboard._keyRecord(vk))
+      else:
+        this.held.remove(vk)
+        records.append(Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP))
+      return True
+
+    def restore(this: Self, records: list[bytes]) -> None:
+      for vk in reversed(this.held):
+        records.append(Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP))
+      this.held.clear()
+
+    def cleanup(this: Self) -> bytes:
+      return b"".join(
+        Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP) for vk in this.used
+      )
+
+  class Macro(NamedTuple):
+    """
+    A compiled macro, packed INPUT batches (bytes) separated by waits in
+    seconds (float), built by Keyboard.compileMacro and never changed
+    """
+    source: str
+    steps: tuple[bytes | float, ...]
+    release: bytes = b""  # Key ups for everything the macro may hold
+
+    def run(this: Self, sleep: Any = time.sleep) -> None:
+      try:
+        for step in this.steps:
+          if isinstance(step, float):
+            sleep(step)
+          else:
+            Keyboard._sendData(step)
+      except BaseException:
+        # Never leave keys held down behind a failed or interrupted run
+        Keyboard._sendData(this.release)
+        raise
+
+  class InputRecorder:
+    """
+    Records real keys, mouse buttons and wheel turns from low-level hooks
+    as fixed-size packed records in a preallocated ring, full segments of
+    the ring can be streamed to a memory-mapped file and any recording can
+    be turned back into a Macro
+
+    Functions:
+      start(): Installs the hooks through the backend
+      stop(): Removes the hooks and writes out the last partial segment
+      onKey(message, vk, scan, flags): Keyboard hook callback
+      onMouse(message, data, flags): Mouse hook callback
+      push(vk, scan, flags): Stores one record
+      events(): Returns the records still in the ring, oldest first
+      toMacro(records): Builds a replayable Macro from records
+      load(path): Reads a recording file back as a Macro
+    """
+    # Microseconds, vk, scan code (wheel delta for the wheel) and flags
+    record: struct.Struct = struct.Struct("<QHHI")
+    # MAGIC then the number of records streamed, the file is grown ahead
+    # of them so a session that never reached stop() ends in zeros
+    header: struct.Struct = struct.Struct("<8sQ")
+    MAGIC: bytes = b"KCREC\x00\x02\x00"
+    MOUSE: int = 0x80000000  # Flag bit marking mouse records
+    # WM_*BUTTONDOWN/UP -> (vk, released)
+    _buttons: dict[int, tuple[int, bool]] = {
+      0x0201: (0x01, False), 0x0202: (0x01, True),
+      0x0204: (0x02, False), 0x0205: (0x02, True),
+      0x0207: (0x04, False), 0x0208: (0x04, True)
+    }
+
+    def __init__(
+        this: Self,
+        capacity: int = 4096,
+        segment: int = 512,
+        path: str | None = None,
+        injected: bool = False,
+        clock: Any = time.monotonic_ns
+    ) -> None:
+      # Keyboard.recordInput reports these through Keyboard.error instead
+      for var, value in (("capacity", capacity), ("segment", segment)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+          raise ValueError(f"{var}: {value!r} is not a positive integer")
+      if segment > capacity:
+        raise ValueError(f"segment: {segment} is larger than capacity: {capacity}")
+      # Segments have to tile the ring so each one is a single slice
+      this.capacity: int = capacity - capacity % segment
+      this.segment: int = segment
+      this.injected: bool = injected
+      this.clock: Any = clock
+      this.buffer: bytearray = bytearray(this.capacity * this.record.size)
+      this.view: memoryview = memoryview(this.buffer)
+      this.head: int = 0      # Records pushed so far
+      this.streamed: int = 0  # Records written to the file so far
+      this.lock: threading.Lock = threading.Lock()
+      this.stop_hooks: Any = None
+      this.file: Any = None
+      this.map: mmap.mmap | None = None
+      this.written: int = 0
+      if path is not None:
+        this.file: Any = open(path, "w+b")
+        this.file.write(this.header.pack(this.MAGIC, 0))
+        this.written: int = this.header.size
+        this._grow(this.written + 4 * segment * this.record.size)
+
+    def __enter__(this: Self) -> Self:
+      this.start()
+      return this
+
+    def __exit__(this: Self, *exc: Any) -> None:
+      this.stop()
+
+    def start(this: Self) -> None:
+      if this.stop_hooks is None:
+        this.stop_hooks: Any = Keyboard.getBackend().hookInput(
+          this.onKey, this.onMouse)
+
+    def stop(this: Self) -> None:
+      if this.stop_hooks is not None:
+        this.stop_hooks()
+        this.stop_hooks: Any = None
+      if this.file is not None:
+        with this.lock:
+          this._stream()
+        this.map.close()
+        this.file.truncate(this.written)
+        this.file.close()
+        this.file: Any = None
+
+    def onKey(this: Self, message: int, vk: int, scan: int, flags: int) -> None:
+      if flags & 0x10 and not this.injected:  # LLKHF_INJECTED
+        return
+      out: int = Keyboard.KEYEVENTF_EXTENDEDKEY if flags & 0x01 else 0
+      if message == Keyboard.WM_KEYUP or message == 0x0105:  # WM_SYSKEYUP
+        out |= Keyboard.KEYEVENTF_KEYUP
+      this.push(vk, scan, out)
+
+    def onMouse(this: Self, message: int, data: int, flags: int) -> None:
+      if flags & 0x01 and not this.injected:  # LLMHF_INJECTED
+        return
+      button: tuple[int, bool] | None = this._buttons.get(message)
+      if message == 0x020B or message == 0x020C:  # WM_XBUTTONDOWN/UP
+        button: tuple[int, bool] = (4 + (data >> 16), message == 0x020C)
+      if button is not None:
+        up: int = Keyboard.KEYEVENTF_KEYUP if button[1] else 0
+        this.push(button[0], 0, this.MOUSE | up)
+      elif message == 0x020A:  # WM_MOUSEWHEEL
+        this.push(0, data >> 16 & 0xFFFF, this.MOUSE | Keyboard.MOUSEEVENTF_WHEEL)
+      elif message == 0x020E:  # WM_MOUSEHWHEEL
+        this.push(0, data >> 16 & 0xFFFF, this.MOUSE | Keyboard.MOUSEEVENTF_HWHEEL)
+
+    def push(this: Self, vk: int, scan: int, flags: int) -> None:
+      # Packed straight into the ring, nothing is allocated per event
+      with this.lock:
+        this.record.pack_into(
+          this.buffer, this.head % this.capacity * this.record.size,
+          this.clock() // 1000, vk, scan, flags
+        )
+        this.head += 1
+        if this.file is not None and this.head - this.streamed == this.segment:
+          this._stream()
+
+    def _stream(this: Self) -> None:
+      # Everything not yet written is contiguous, segments tile the ring
+      size: int = this.record.size
+      start: int = this.streamed % this.capacity * size
+      end: int = start + (this.head - this.streamed) * size
+      needed: int = this.written + end - start
+      if needed > len(this.map):
+        this._grow(max(needed, 2 * len(this.map)))
+      this.map[this.written:needed] = this.view[start:end]
+      this.written: int = needed
+      this.streamed: int = this.head
+      # Only counted once the records themselves are in
+      this.header.pack_into(this.map, 0, this.MAGIC, this.streamed)
+
+    def _grow(this: Self, size: int) -> None:
+      if this.map is not None:
+        this.map.close()
+      this.file.truncate(size)
+      this.map: mmap.mmap = mmap.mmap(this.file.fileno(), size)
+
+    def events(this: Self) -> list[tuple[int, int, int, int]]:
+      with this.lock:
+        count: int = min(this.head, this.capacity)
+        start: int = (this.head - count) % this.capacity * this.record.size
+        data: bytes = bytes(this.view[start:]) + bytes(this.view[:start])
+      return list(this.record.iter_unpack(data[:count * this.record.size]))
+
+    @staticmethod
+    def toMacro(records: Any, source: str = "<recording>") -> Any:
+      """
+      Builds a Macro that replays records with their original timing, gaps
+      under a millisecond are sent together in one batch
+
+      Returns:
+        Macro: Ready to pass to Keyboard.runMacro
+      """
+      mouse: int = Keyboard.InputRecorder.MOUSE
+      wheels: int = Keyboard.MOUSEEVENTF_WHEEL | Keyboard.MOUSEEVENTF_HWHEEL
+      up: int = Keyboard.KEYEVENTF_KEYUP
+      steps: list[bytes | float] = []
+      batch: list[bytes] = []
+      keys: set[int] = set()
+      buttons: set[int] = set()
+      last: int | None = None
+      for stamp, vk, scan, flags in records:
+        if last is not None and stamp - last >= 1000:
+          if batch:
+            steps.append(b"".join(batch))
+            batch: list[bytes] = []
+          steps.append((stamp - last) / 1e6)
+        last: int = stamp
+        if not flags & mouse:
+          batch.append(Keyboard._keyRecord(vk, flags))
+          keys.add(vk)
+        elif flags & wheels:
+          delta: int = scan - 0x10000 if scan & 0x8000 else scan
+          batch.append(Keyboard._mouseRecord(0, 0, flags & wheels, delta))
+        elif vk in Keyboard.mouse_buttons:
+          down, release, data = Keyboard.mouse_buttons[vk]
+          batch.append(Keyboard._mouseRecord(
+            0, 0, release if flags & up else down, data))
+          buttons.add(vk)
+      if batch:
+        steps.append(b"".join(batch))
+      # Key ups for everything touched, a cut-off recording can end held
+      release_all: bytes = b"".join(
+        [Keyboard._keyRecord(vk, up) for vk in sorted(keys)] + [
+          Keyboard._mouseRecord(0, 0, *Keyboard.mouse_buttons[vk][1:])
+          for vk in sorted(buttons)
+        ]
+      )
+      return Keyboard.Macro(source, tuple(steps), release_all)
+
+    @staticmethod
+    def load(path: str) -> Any:
+      """
+      Reads a recording file back as a Macro, only the records counted in
+      the header, so a file left behind by a crash stops where it was cut
+      """
+      header: struct.Struct = Keyboard.InputRecorder.header
+      size: int = Keyboard.InputRecorder.record.size
+      with open(path, "rb") as file:
+        data: bytes = file.read()
+      if len(data) < header.size or data[:8] != Keyboard.InputRecorder.MAGIC:
+        raise ValueError(f"file: {path} is not a keyboard-cat recording")
+      count: int = min(header.unpack_from(data)[1], (len(data) - header.size) // size)
+      records: list[tuple[int, int, int, int]] = list(
+        Keyboard.InputRecorder.record.iter_unpack(
+          data[header.size:header.size + count * size])
+      )
+      return Keyboard.InputRecorder.toMacro(records, path)
+
+  @staticmethod
+  def recordInput(
+      capacity: int = 4096,
+      segment: int = 512,
+      path: str | None = None,
+      injected: bool = False
+  ) -> Any:
+    """
+    Creates an InputRecorder, EX: with Keyboard.recordInput(path="a.rec"):
+
+    Args:
+      capacity (int, optional): Records kept in the ring, rounded down to
+      a whole number of segments
+      segment (int, optional): Records streamed to the file at a time
+      path (str, optional): File the recording is streamed to
+      injected (bool, optional): Also record injected input
+
+    Returns:
+      InputRecorder: Not started yet, start() it or use it in a with block
+    """
+    for var, value in (("capacity", capacity), ("segment", segment)):
+      if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        Keyboard.error(error_type="p", var=var, type="positive integer")
+        return Keyboard.exit_code
+    if segment > capacity:
+      Keyboard.error(
+        error_type="r", runtime_error="given segment is larger than capacity")
+      return Keyboard.exit_code
+    if path is not None and not isinstance(path, str):
+      Keyboard.error(error_type="p", var="path", type="string")
+      return Keyboard.exit_code
+    return Keyboard.InputRecorder(capacity, segment, path, injected)
+
+  # A quoted string or any run of non-space characters
+  _macro_token: re.Pattern = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+  _macro_delay: re.Pattern = re.compile(r"@(\d+(?:\.\d+)?)(ms|s)?$")
+
+  @staticmethod
+  @functools.lru_cache(maxsize=128)
+  def _compileMacro(source: str) -> Any:
+    # Raises ValueError, which lru_cache never stores, on bad macros
+    up: int = Keyboard.KEYEVENTF_KEYUP
+    shift: int = Keyboard.vk_codes["shift"]
+    state: Keyboard.ModifierState = Keyboard.ModifierState()
+    steps: list[bytes | float] = []
+    batch: list[bytes] = []
+    held: list[int] = []
+    ever_held: set[int] = set()
+
+    def key(name: str) -> int:
+      vk: int | None = Keyboard.index.vk_of.get(name.lower())
+      if vk is None:
+        raise ValueError(f"macro key: {name} is not in vk_codes map")
+      return vk
+
+    def press(vk: int) -> None:
+      if vk in state.modifiers:
+        state.set(vk, True, batch)
+      elif vk not in held:
+        held.append(vk)
+        ever_held.add(vk)
+        batch.append(Keyboard._keyRecord(vk))
+
+    def release(vk: int) -> None:
+      if vk in state.modifiers:
+        state.set(vk, False, batch)
+      elif vk in held:
+        held.remove(vk)
+        batch.append(Keyboard._keyRecord(vk, up))
+
+    for match in Keyboard._macro_token.finditer(source):
+      text: str | None = match.group(1)
+      token: str = match.group(2) or ""
+      delay: re.Match | None = Keyboard._macro_delay.match(token)
+      if text is not None:
+        # Typed text is literal, shift goes back to how it was afterwards
+        shifted: bool = state.isDown(shift)
+        batch.extend(Keyboard._compileWrite(re.sub(r"\\(.)", r"\1", text), state))
+        state.set(shift, shifted, batch)
+      elif delay:
+        if batch:
+          steps.append(b"".join(batch))
+          batch: list[bytes] = []
+        seconds: float = float(delay.group(1))
+        steps.append(seconds / 1000 if delay.group(2) == "ms" else seconds)
+      elif token.lower() in Keyboard.index.vk_of:
+        vk: int = key(token)
+        if vk in state.modifiers:
+          # Tapped through the state like a chord, a held modifier stays held
+          if not state.isDown(vk):
+            press(vk)
+            release(vk)
+        else:
+          batch.extend((Keyboard._keyRecord(vk), Keyboard._keyRecord(vk, up)))
+      elif token[0] == "+" and len(token) > 1:
+        press(key(token[1:]))
+      elif token[0] == "-" and len(token) > 1:
+        release(key(token[1:]))
+      else:
+        # Modifiers that were already held stay held after the chord
+        chord: list[int] = [key(name) for name in token.split("+")]
+        pressed: list[int] = [
+          vk for vk in chord
+          if vk not in state.modifiers or not state.isDown(vk)
+        ]
+        for vk in pressed:
+          press(vk)
+        for vk in reversed(pressed):
+          release(vk)
+
+    # Nothing stays held once a macro is over
+    batch.extend(Keyboard._keyRecord(vk, up) for vk in reversed(held))
+    state.restore(batch)
+    if batch:
+      steps.append(b"".join(batch))
+    cleanup: bytes = state.cleanup() + b"".join(
+      Keyboard._keyRecord(vk, up) for vk in ever_held
+    )
+    return Keyboard.Macro(source, tuple(steps), cleanup)
+
+  class AsyncKeyboard:
+    """
+    asyncio front end, every blocking send runs on one shared executor
+    thread and every wait is an asyncio.sleep, so many timed sequences
+    can share a single event loop
+
+    Functions:
+      press(key): Presses and releases a key
+      type(text, cps): Types text, optionally at a number of chars per second
+      runMacro(macro): Runs a macro, awaiting its waits
+    """
+    # asyncio and concurrent.futures are imported on first use, they cost
+    # more than the rest of this module and most callers never touch them
+    _executor: "ThreadPoolExecutor | None" = None
+
+    def __init__(this: Self, executor: "ThreadPoolExecutor | None" = None) -> None:
+      this.executor: ThreadPoolExecutor = executor or Keyboard.AsyncKeyboard.sharedExecutor()
+
+    @staticmethod
+    def sharedExecutor() -> "ThreadPoolExecutor":
+      """
+      Returns the single thread every AsyncKeyboard sends from by default
+      """
+      if Keyboard.AsyncKeyboard._executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        Keyboard.AsyncKeyboard._executor = ThreadPoolExecutor(
+          max_workers=1, thread_name_prefix="keyboard"
+        )
+      return Keyboard.AsyncKeyboard._executor
+
+    async def _call(this: Self, function: Any, *args: Any) -> Any:
+      import asyncio
+      loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+      return await loop.run_in_executor(this.executor, function, *args)
+
+    async def press(this: Self, key_code: Any) -> None:
+      await this._call(Keyboard.pressAndReleaseKey, key_code)
+
+    async def type(this: Self, source_str: str, cps: float | None = None) -> None:
+      """
+      Types text, in one batch or spread out on a fixed schedule
+
+      Args:
+        source_str (str): Same characters as keyboardWrite accepts
+        cps (float, optional): Characters per second, None types it all at once
+      """
+      if cps is None:
+        await this._call(Keyboard.keyboardWrite, source_str)
+        return None
+      if not isinstance(cps, int | float) or isinstance(cps, bool) or not cps > 0:
+        Keyboard.error(error_type="p", var="cps", type="positive number")
+        return Keyboard.exit_code
+      if not isinstance(source_str, str):
+        Keyboard.error(error_type="p", var="string", type="string")
+        return Keyboard.exit_code
+
+      Keyboard._syncLayout()
+      state: Keyboard.ModifierState = Keyboard.ModifierState()
+      try:
+        chars: list[bytes] = [
+          b"".join(Keyboard._compileWrite(char, state)) for char in source_str
+        ]
+      except ValueError as e:
+        Keyboard.error(error_type="r", runtime_error=str(e))
+        return Keyboard.exit_code
+      end: list[bytes] = []
+      state.restore(end)
+
+      # Deadlines from the loop's clock so slow sends never add up
+      import asyncio
+      loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+      start: float = loop.time()
+      try:
+        for i, data in enumerate(chars):
+          await asyncio.sleep(max(0.0, start + i / cps - loop.time()))
+          await this._call(Keyboard._sendData, data)
+        await this._call(Keyboard._sendData, b"".join(end))
+      except BaseException:
+        await asyncio.shield(this._call(Keyboard._sendData, state.cleanup()))
+        raise
+
+    async def runMacro(this: Self, macro: Any) -> None:
+      """
+      Runs a macro source or compiled Macro, awaiting instead of sleeping
+      """
+      if not isinstance(macro, Keyboard.Macro):
+        macro: Keyboard.Macro | None = Keyboard.compileMacro(macro)
+        if macro is None:
+          return Keyboard.exit_code
+      import asyncio
+      try:
+        for step in macro.steps:
+          if isinstance(step, float):
+            await asyncio.sleep(step)
+          else:
+            await this._call(Keyboard._sendData, step)
+      except BaseException:
+        await asyncio.shield(this._call(Keyboard._sendData, macro.release))
+        raise
 
   # Functions (most people will only use these)
 
   @staticmethod
-  def getKeyState(key_code: str | int) -> bool:
+  def resolve(key_code: Any, var: str = "key_code") -> Any:
     """
-    Returns the given key's current state
+    Validates a key once so it can be reused without further checks
 
     Args:
-      key_code (str | int): The key to be checked for state
+      key_code (str | int | KeyHandle): Any key in vk_codes, by name or VK
+      var (str, optional): The parameter name used in error messages
 
     Returns:
-      bool: "False" if the key is not pressed and "True" if it is
+      KeyHandle: The validated key, None if it is not valid
     """
+    if isinstance(key_code, Keyboard.KeyHandle):
+      return key_code
     if not isinstance(key_code, str | int):
-      Keyboard.error(error_type="p", var="key_code",
-                     type="integer or string")
-      return Keyboard.exit_code
+      Keyboard.error(error_type="p", var=var, type="integer or string")
+      return None
 
-    if Keyboard._lookup(key_code) is not False:
-      key_code: int = Keyboard._lookup(key_code)
-    elif key_code not in Keyboard.vk_codes and key_code not in Keyboard.vk_codes.values():
+    key: Keyboard.KeyHandle | None = Keyboard.index.handles.get(key_code)
+    if key is None:
       Keyboard.error(
         error_type="r", runtime_error="given key code is not valid")
+    return key
+
+  @staticmethod
+  def getKeyState(key_code: str | int) -> bool:
+    """
+    Returns the given key's current state
+
+    Args:
+      key_code (str | int): The key to be checked for state
+
+    Returns:
+      bool: "False" if the key is not pressed and "True" if it is
+    """
+    key: Keyboard.KeyHandle | None = Keyboard.resolve(key_code)
+    if key is None:
       return Keyboard.exit_code
 
-    integer_state: int = Keyboard.user32.GetKeyState(key_code)
-    key_state: bool = True if integer_state == 1 else False
+    integer_state: int = Keyboard.getBackend().getKeyState(key.vk)
+    # The high bit is "pressed", the low bit is only the toggle state
+    key_state: bool = True if integer_state & 0x8000 else False
 
     if "key_state" in locals():
       return key_state
@@ -423,6 +2088,85 @@ class Keyboard:
     # The ManipulateMouse class also has a function for this
     Keyboard.ManipulateMouse.setPosition(x, y)
 
+  @staticmethod
+  def glideCursor(
+      x: int,
+      y: int,
+      duration: float = 0.25,
+      path: str = "linear",
+      ease: bool = True,
+      rate: int = 120,
+      sleep: Any = time.sleep,
+      clock: Any = time.monotonic
+  ) -> None:
+    """
+    Moves the cursor along a path instead of teleporting it, the path is
+    precomputed and sent in batches, one per frame
+
+    Args:
+      x (int): The x-coordinate to end at
+      y (int): The y-coordinate to end at
+      duration (float, optional): Seconds the move should take
+      path (str, optional): "linear" or "bezier"
+      ease (bool, optional): Start and finish slowly
+      rate (int, optional): Points per second along the path
+      sleep (Any, optional): Called with the seconds to wait between frames
+      clock (Any, optional): Where the frame deadlines are measured from
+    """
+    if not isinstance(x, int):
+      Keyboard.error(error_type="p", var="x", type="integer")
+      return Keyboard.exit_code
+    if not isinstance(y, int):
+      Keyboard.error(error_type="p", var="y", type="integer")
+      return Keyboard.exit_code
+    if path not in ("linear", "bezier"):
+      Keyboard.error(
+        error_type="r", runtime_error="given path is not valid")
+      return Keyboard.exit_code
+
+    backend: Keyboard.InputBackend = Keyboard.getBackend()
+    steps: int = max(1, math.ceil(duration * rate))
+    shape: Any = Keyboard.Motion.bezier if path == "bezier" else Keyboard.Motion.linear
+    points: list[tuple[int, int]] = shape(
+      backend.getCursorPos(), (x, y), steps,
+      ease=Keyboard.Motion.easeInOut if ease else None
+    )
+    data: bytes = Keyboard.Motion.toRecords(points, backend.screenSize())
+
+    # One batch per 60 Hz frame, timed against deadlines so it never drifts
+    frames: int = max(1, math.ceil(duration * 60))
+    per_frame: int = math.ceil(steps / frames)
+    size: int = ctypes.sizeof(Keyboard.INPUT)
+    start: float = clock()
+    for frame, first in enumerate(range(0, steps, per_frame)):
+      if frame:
+        sleep(max(0.0, start + frame * duration / frames - clock()))
+      Keyboard._sendData(data[first * size:(first + per_frame) * size])
+
+  @staticmethod
+  def nudgeMouse(distance: int = 0) -> None:
+    """
+    Moves the mouse by distance and straight back in a single SendInput,
+    without reading or setting the cursor position
+
+    Args:
+      distance (int, optional): Pixels to move on both axes, 0 sends a
+      zero length move pair that still counts as input
+    """
+    if not isinstance(distance, int):
+      Keyboard.error(error_type="p", var="distance", type="integer")
+      return Keyboard.exit_code
+    if distance < 0:
+      Keyboard.error(
+        error_type="r", runtime_error="given distance is less than 0")
+      return Keyboard.exit_code
+
+    Keyboard._sendData(
+      Keyboard._mouseRecord(distance, distance, Keyboard.MOUSEEVENTF_MOVE)
+      + Keyboard._mouseRecord(-distance, -distance, Keyboard.MOUSEEVENTF_MOVE),
+      atomic=True
+    )
+
   @staticmethod
   def scrollMouse(direction: str, amount: int, dx: int = 0, dy: int = 0) -> None:
     """
@@ -468,6 +2212,51 @@ class Keyboard:
     elif direction == "left":
       Keyboard.mouseScroll("horizontal", -amount, dx, dy)
 
+  @staticmethod
+  def scrollSequence(steps: list[tuple[str, int]]) -> None:
+    """
+    Scrolls through a mix of directions in one SendInput call, neighbouring
+    steps in the same direction are merged into a single wheel event
+
+    Args:
+      steps (list[tuple[str, int]]): (direction, amount) pairs, directions
+        are the same as scrollMouse's
+    """
+    signs: dict[str, tuple[str, int]] = {
+      "up": ("v", 1), "down": ("v", -1), "right": ("h", 1), "left": ("h", -1)
+    }
+    # A clock that never moves keeps every step inside one window
+    scroller: Keyboard.Scroller = Keyboard.Scroller(clock=lambda: 0.0, autoflush=False)
+    for direction, amount in steps:
+      if direction not in signs:
+        Keyboard.error(
+          error_type="r", runtime_error="given direction is not valid")
+        return Keyboard.exit_code
+      if not isinstance(amount, int) or amount < 1:
+        Keyboard.error(
+          error_type="r", runtime_error="given amount is less than 1")
+        return Keyboard.exit_code
+      axis, sign = signs[direction]
+      scroller.scroll(axis, sign * amount)
+    scroller.flush()
+
+  @staticmethod
+  def _mouseButton(mouse_button: Any) -> tuple[bytes, bytes] | None:
+    # Validates a button once and returns its down and up records
+    button: Keyboard.KeyHandle | None = Keyboard.resolve(
+      mouse_button, "mouse_button")
+    if button is None:
+      return None
+    if button.vk not in Keyboard.mouse_buttons:
+      Keyboard.error(
+        error_type="r", runtime_error="given key code is not a mouse button")
+      return None
+    down, up, data = Keyboard.mouse_buttons[button.vk]
+    return (
+      Keyboard._mouseRecord(0, 0, down, data),
+      Keyboard._mouseRecord(0, 0, up, data)
+    )
+
   @staticmethod
   def pressMouse(mouse_button: str | int) -> None:
     """
@@ -479,38 +2268,14 @@ class Keyboard:
         right_mouse,
         middle_mouse,
         mouse_button1,
-        mouse_button
+        mouse_button2
       )
     """
-    if not isinstance(mouse_button, str | int):
-      Keyboard.error(
-        error_type="p", var="mouse_button", type="integer or string")
+    records: tuple[bytes, bytes] | None = Keyboard._mouseButton(mouse_button)
+    if records is None:
       return Keyboard.exit_code
 
-    mouse_list: list = [
-      "left_mouse", 0x01, "right_mouse", 0x02, "middle_mouse", 0x04,
-      "mouse_button1", 0x05, "mouse_button2", 0x06
-    ]
-    if mouse_button not in mouse_list and hex(mouse_button) not in mouse_list:
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not a mouse button")
-      return Keyboard.exit_code
-
-    if Keyboard._lookup(mouse_button) is not False:
-      mouse_button: int = Keyboard._lookup(mouse_button)
-    elif mouse_button not in Keyboard.vk_codes and mouse_button not in Keyboard.vk_codes.values():
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
-      return Keyboard.exit_code
-
-    x: Keyboard.INPUT = Keyboard.INPUT(
-      type=Keyboard.INPUT_MOUSE,
-      mi=MOUSEINPUT(
-        wVk=mouse_button,
-        dwFlags=Keyboard.KEYEVENTF_KEYUP
-      )
-    )
-    Keyboard.user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    Keyboard._sendData(records[0])
 
   @staticmethod
   def releaseMouse(mouse_button: str | int) -> None:
@@ -523,36 +2288,95 @@ class Keyboard:
         right_mouse,
         middle_mouse,
         mouse_button1,
-        mouse_button
+        mouse_button2
       )
     """
-    if not isinstance(mouse_button, str | int):
-      Keyboard.error(
-        error_type="p", var="mouse_button", type="integer or string")
+    records: tuple[bytes, bytes] | None = Keyboard._mouseButton(mouse_button)
+    if records is None:
       return Keyboard.exit_code
 
-    mouse_list: list = [
-      "left_mouse", 0x01, "right_mouse", 0x02, "middle_mouse", 0x04,
-      "mouse_button1", 0x05, "mouse_button2", 0x06
-    ]
-    if mouse_button not in mouse_list and hex(mouse_button) not in mouse_list:
+    Keyboard._sendData(records[1])
+
+  @staticmethod
+  def doubleClickMouse(
+      mouse_button: str | int = "left_mouse",
+      gap: float = 0.0,
+      sleep: Any = time.sleep
+  ) -> None:
+    """
+    Double-clicks a mouse button, with no gap both clicks go out in one
+    SendInput call so they always land inside the system double-click time
+
+    Args:
+      mouse_button (str | int, optional): Same buttons as pressMouse
+      gap (float, optional): Seconds between the clicks, has to be shorter
+        than the system double-click time
+      sleep (Any, optional): Called with the gap between the clicks
+    """
+    if not isinstance(gap, (int, float)) or gap < 0:
+      Keyboard.error(error_type="p", var="gap", type="non-negative number")
+      return Keyboard.exit_code
+    if gap * 1000 >= Keyboard.getBackend().doubleClickTime():
       Keyboard.error(
-        error_type="r", runtime_error="given key code is not a mouse button"
-      )
+        error_type="r",
+        runtime_error="given gap is not shorter than the double-click time")
       return Keyboard.exit_code
+    records: tuple[bytes, bytes] | None = Keyboard._mouseButton(mouse_button)
+    if records is None:
+      return Keyboard.exit_code
+
+    click: bytes = records[0] + records[1]
+    if gap:
+      Keyboard._sendData(click, atomic=True)
+      sleep(gap)
+      Keyboard._sendData(click, atomic=True)
+    else:
+      Keyboard._sendData(click * 2, atomic=True)
+
+  @staticmethod
+  def dragMouse(
+      x: int,
+      y: int,
+      mouse_button: str | int = "left_mouse",
+      steps: int = 32,
+      path: str = "linear"
+  ) -> None:
+    """
+    Drags from the cursor's position to a point as one SendInput call, so
+    the button down, every move and the button up land back to back
 
-    if Keyboard._lookup(mouse_button) is not False:
-      mouse_button: int = Keyboard._lookup(mouse_button)
-    elif mouse_button not in Keyboard.vk_codes and mouse_button not in Keyboard.vk_codes.values():
+    Args:
+      x (int): The x-coordinate to drop at
+      y (int): The y-coordinate to drop at
+      mouse_button (str | int, optional): Same buttons as pressMouse
+      steps (int, optional): Moves between pick up and drop
+      path (str, optional): "linear" or "bezier"
+    """
+    if not isinstance(x, int):
+      Keyboard.error(error_type="p", var="x", type="integer")
+      return Keyboard.exit_code
+    if not isinstance(y, int):
+      Keyboard.error(error_type="p", var="y", type="integer")
+      return Keyboard.exit_code
+    # Down and up have to fit in the same SendInput call as the moves
+    if not isinstance(steps, int) or not 0 < steps <= Keyboard.MAX_BATCH - 2:
       Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
+        error_type="r", runtime_error="given steps does not fit one batch")
+      return Keyboard.exit_code
+    if path not in ("linear", "bezier"):
+      Keyboard.error(
+        error_type="r", runtime_error="given path is not valid")
+      return Keyboard.exit_code
+    records: tuple[bytes, bytes] | None = Keyboard._mouseButton(mouse_button)
+    if records is None:
       return Keyboard.exit_code
 
-    x: Keyboard.INPUT = Keyboard.INPUT(
-      type=Keyboard.INPUT_MOUSE,
-      mi=MOUSEINPUT(wVk=mouse_button)
+    backend: Keyboard.InputBackend = Keyboard.getBackend()
+    shape: Any = Keyboard.Motion.bezier if path == "bezier" else Keyboard.Motion.linear
+    moves: bytes = Keyboard.Motion.toRecords(
+      shape(backend.getCursorPos(), (x, y), steps), backend.screenSize()
     )
-    Keyboard.user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    Keyboard._sendData(records[0] + moves + records[1], atomic=True)
 
   @staticmethod
   def pressKey(key_code: str | int) -> None:
@@ -560,25 +2384,14 @@ class Keyboard:
     Presses a keyboard key
 
     Args:
-      key_code (str | int): All keys in vk_codes dict are valid
+      key_code (str | int | KeyHandle): All keys in vk_codes dict are valid,
+      handles from Keyboard.resolve skip validation
     """
-    if not isinstance(key_code, str | int):
-      Keyboard.error(error_type="p", var="key_code",
-                     type="integer or string")
+    key: Keyboard.KeyHandle | None = Keyboard.resolve(key_code)
+    if key is None:
       return Keyboard.exit_code
 
-    if Keyboard._lookup(key_code) is not False:
-      key_code: int = Keyboard._lookup(key_code)
-    elif key_code not in Keyboard.vk_codes and key_code not in Keyboard.vk_codes.values():
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
-      return Keyboard.exit_code
-
-    x: Keyboard.INPUT = Keyboard.INPUT(
-      type=Keyboard.INPUT_KEYBOARD,
-      ki=KEYBDINPUT(wVk=key_code)
-    )
-    Keyboard.user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    Keyboard.Raw.press(key.vk)
 
   @staticmethod
   def releaseKey(key_code: str | int) -> None:
@@ -586,28 +2399,14 @@ class Keyboard:
     Releases a keyboard key
 
     Args:
-      key_code (str | int): All keys in vk_codes dict are valid
+      key_code (str | int | KeyHandle): All keys in vk_codes dict are valid,
+      handles from Keyboard.resolve skip validation
     """
-    if not isinstance(key_code, str | int):
-      Keyboard.error(error_type="p", var="key_code",
-                     type="integer or string")
-      return Keyboard.exit_code
-
-    if Keyboard._lookup(key_code) is not False:
-      key_code: int = Keyboard._lookup(key_code)
-    elif key_code not in Keyboard.vk_codes and key_code not in Keyboard.vk_codes.values():
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
+    key: Keyboard.KeyHandle | None = Keyboard.resolve(key_code)
+    if key is None:
       return Keyboard.exit_code
 
-    x: Keyboard.INPUT = Keyboard.INPUT(
-      type=Keyboard.INPUT_KEYBOARD,
-      ki=KEYBDINPUT(
-        wVk=key_code,
-        dwFlags=Keyboard.KEYEVENTF_KEYUP
-      )
-    )
-    Keyboard.user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    Keyboard.Raw.release(key.vk)
 
   @staticmethod
   def pressAndReleaseKey(key_code: str | int) -> None:
@@ -615,22 +2414,14 @@ class Keyboard:
     Presses and releases a keyboard key sequentially
 
     Args:
-      key_code (str | int): All keys in vk_codes dict are valid
+      key_code (str | int | KeyHandle): All keys in vk_codes dict are valid,
+      handles from Keyboard.resolve skip validation
     """
-    if not isinstance(key_code, str | int):
-      Keyboard.error(error_type="p", var="key_code",
-                     type="integer or string")
-      return Keyboard.exit_code
-
-    if Keyboard._lookup(key_code) is not False:
-      key_code: int = Keyboard._lookup(key_code)
-    elif key_code not in Keyboard.vk_codes and key_code not in Keyboard.vk_codes.values():
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
+    key: Keyboard.KeyHandle | None = Keyboard.resolve(key_code)
+    if key is None:
       return Keyboard.exit_code
 
-    Keyboard.pressKey(key_code)
-    Keyboard.releaseKey(key_code)
+    Keyboard.Raw.tap(key.vk)
 
   @staticmethod
   def pressAndReleaseMouse(mouse_button: str | int) -> None:
@@ -646,98 +2437,163 @@ class Keyboard:
         mouse_button2
       )
     """
-    if not isinstance(mouse_button, str | int):
-      Keyboard.error(
-        error_type="p", var="mouse_button", type="integer or string")
+    records: tuple[bytes, bytes] | None = Keyboard._mouseButton(mouse_button)
+    if records is None:
       return Keyboard.exit_code
 
-    mouse_dict: dict[str, int] = {
-      "left_mouse": 0x01,
-      "right_mouse": 0x02,
-      "middle_mouse": 0x04,
-      "mouse_button1": 0x05,
-      "mouse_button2": 0x06
-    }
+    Keyboard._sendData(records[0] + records[1], atomic=True)
 
-    if isinstance(mouse_button, str):
-      if mouse_button not in mouse_dict:
-        Keyboard.error(
-          error_type="r", runtime_error="given key code is not a mouse button")
-        return Keyboard.exit_code
-      mouse_button_code: int = mouse_dict[mouse_button]
-    else:
-      if mouse_button not in mouse_dict.values():
-        Keyboard.error(
-          error_type="r", runtime_error="given key code is not a mouse button")
-        return Keyboard.exit_code
-      mouse_button_code: int = mouse_button
-
-    original_name: str = mouse_button if isinstance(mouse_button, str) else next(
-      key for key, value in mouse_dict.items() if value == mouse_button)
-
-    if Keyboard._lookup(mouse_button_code) is not False:
-      mouse_button_code: int | bool = Keyboard._lookup(mouse_button_code)
-    elif mouse_button_code not in Keyboard.vk_codes and mouse_button_code not in Keyboard.vk_codes.values():
-      Keyboard.error(
-        error_type="r", runtime_error="given key code is not valid")
-      return Keyboard.exit_code
+  @staticmethod
+  def _compileWrite(source_str: str, state: Any) -> list[bytes]:
+    # Builds the INPUT sequence for a string without sending anything,
+    # shift is only touched when the next character needs it flipped
+    shift: int = Keyboard.vk_codes["shift"]
+    up: int = Keyboard.KEYEVENTF_KEYUP
+    records: list[bytes] = []
+    for char in source_str:
+      key: Keyboard.KeyHandle | None = Keyboard.index.chars.get(char)
+      if key is None:
+        raise ValueError(f"character: {char} is not in vk_codes map")
 
-    Keyboard.pressMouse(original_name)
-    Keyboard.releaseMouse(original_name)
+      state.set(shift, key.shift, records)
+      records.append(Keyboard._keyRecord(key.vk))
+      records.append(Keyboard._keyRecord(key.vk, up))
+    return records
 
   @staticmethod
-  def keyboardWrite(source_str: str) -> None:
+  def keyboardWrite(source_str: str, batched: bool = True) -> None:
     """
     Writes by sending virtual inputs
 
     Args:
       source_str (str): The string to be inputted on the keyboard, all
       keys in the "Alphanumerical" section of vk_codes dict are valid
+      batched (bool, optional): Send the whole string as one INPUT array
+      (split into MAX_BATCH sized chunks), if False the same events are
+      sent one per call
     """
     if not isinstance(source_str, str):
       Keyboard.error(error_type="p", var="string", type="string")
       return Keyboard.exit_code
 
-    shift_alternate: set[str] = set("|~?:{}\"!@#$%^&*()_+<>")
-    for char in source_str:
-      if char not in Keyboard.vk_codes and not char.isupper():
-        Keyboard.error(
-          error_type="r",
-          runtime_error=f"character: {char} is not in vk_codes map"
-        )
-        return Keyboard.exit_code
-
-      if char.isupper() or char in shift_alternate:
-        Keyboard.pressKey("shift")
+    Keyboard._syncLayout()
+    state: Keyboard.ModifierState = Keyboard.ModifierState()
+    try:
+      records: list[bytes] = Keyboard._compileWrite(source_str, state)
+    except ValueError as e:
+      Keyboard.error(error_type="r", runtime_error=str(e))
+      return Keyboard.exit_code
+    state.restore(records)  # Ensure shift is released
+    try:
+      if batched:
+        Keyboard.Raw.send(records)
       else:
-        Keyboard.releaseKey("shift")
+        # Same events as batched, only paced one per call
+        for record in records:
+          Keyboard._sendData(record)
+    except BaseException:
+      Keyboard._sendData(state.cleanup())
+      raise
 
-      key_code: int | bool = Keyboard._lookup(char.lower())
-      if key_code is False:
-        Keyboard.error(
-          error_type="r",
-          runtime_error=f"character: {char} is not in vk_codes map"
-        )
-        return Keyboard.exit_code
+  @staticmethod
+  def unicodeWrite(source_str: str, chunk_size: int | None = None) -> None:
+    """
+    Types any text as KEYEVENTF_UNICODE events, no VK lookup, no shift
+    and no dependence on the keyboard layout
 
-      for flag in [0, Keyboard.KEYEVENTF_KEYUP]:
-        x: Keyboard.INPUT = Keyboard.INPUT(
-          type=Keyboard.INPUT_KEYBOARD,
-          ki=KEYBDINPUT(wVk=key_code, dwFlags=flag)
-        )
-        Keyboard.user32.SendInput(1, ctypes.byref(x), ctypes.sizeof(x))
+    Args:
+      source_str (str): The text to type, anything outside the BMP is sent
+      as a surrogate pair
+      chunk_size (int, optional): Most events per SendInput call, capped at
+      MAX_BATCH which is also the default, odd sizes are rounded down so
+      a character's down and up, or both halves of a surrogate pair,
+      always share a call
+    """
+    if not isinstance(source_str, str):
+      Keyboard.error(error_type="p", var="string", type="string")
+      return Keyboard.exit_code
+    if chunk_size is not None and (
+        not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 2):
+      Keyboard.error(error_type="p", var="chunk_size", type="integer of at least 2")
+      return Keyboard.exit_code
 
-    Keyboard.releaseKey("shift")  # Ensure shift is released
+    # Apps expect real Enter and Tab presses, not the control characters
+    Keyboard._syncLayout()
+    special: dict[int, bytes] = {
+      ord(char): Keyboard._keyRecord(vk) + Keyboard._keyRecord(vk, Keyboard.KEYEVENTF_KEYUP)
+      for char, vk in (("\n", 0x0D), ("\t", 0x09))
+    }
+    units: memoryview = memoryview(
+      source_str.replace("\r\n", "\n").encode("utf-16-le")
+    ).cast("H")
+    data: bytes = b"".join(special.get(unit) or Keyboard._unicodeRecords(unit) for unit in units)
+    # Already limited by the rate limiter's burst, so sent as is below
+    events: int = max(Keyboard._chunkEvents(chunk_size) // 2 * 2, 2)
+    if not any(0xD800 <= unit <= 0xDBFF for unit in units):
+      # Every character is one down/up pair, an even size never splits one
+      Keyboard._sendData(data, events, atomic=True)
+      return None
+
+    # Cut between characters only, so a surrogate pair never straddles two calls
+    pair: int = 2 * ctypes.sizeof(Keyboard.INPUT)
+    chunks: list[bytes] = []
+    start: int = 0
+    count: int = 0
+    for i, unit in enumerate(units):
+      if 0xDC00 <= unit <= 0xDFFF:
+        continue  # Goes with the high surrogate before it
+      need: int = 4 if 0xD800 <= unit <= 0xDBFF else 2
+      if count and count + need > events:
+        chunks.append(data[start * pair:i * pair])
+        start, count = i, 0
+      count += need
+    chunks.append(data[start * pair:])
+    Keyboard._sendChunks(chunks)
+
+  @staticmethod
+  def compileMacro(source: str) -> Any:
+    """
+    Compiles a macro once, repeated sources come from an LRU cache
+
+    Args:
+      source (str): Space separated steps, any mix of:
+        "text"           types the quoted text
+        tab, ctrl+c      presses a key or chord and releases it
+        +alt, -alt       holds or releases a key
+        @2s, @250ms, @1  waits, plain numbers are seconds
+
+    Returns:
+      Macro: The compiled macro, None if the source is not valid
+    """
+    if not isinstance(source, str):
+      Keyboard.error(error_type="p", var="source", type="string")
+      return Keyboard.exit_code
+
+    Keyboard._syncLayout()
+    try:
+      return Keyboard._compileMacro(source)
+    except ValueError as e:
+      Keyboard.error(error_type="r", runtime_error=str(e))
+      return Keyboard.exit_code
+
+  @staticmethod
+  def runMacro(macro: Any, sleep: Any = time.sleep) -> None:
+    """
+    Runs a macro, EX: Keyboard.runMacro('ctrl+l "example.com" enter')
+
+    Args:
+      macro (str | Macro): Macro source or one from compileMacro
+      sleep (Any, optional): Called with the seconds of every wait
+    """
+    if not isinstance(macro, Keyboard.Macro):
+      macro: Keyboard.Macro | None = Keyboard.compileMacro(macro)
+      if macro is None:
+        return Keyboard.exit_code
+    macro.run(sleep)
 
   @staticmethod
   def altTab() -> None:
     """
     My development test function, just opens alt-tab menu
     """
-    # Here we use the value of alt and tab, so we can
-    # test if the functions still take VK codes directly
-    Keyboard.pressKey(Keyboard.vk_codes["alt"])
-    Keyboard.pressKey(Keyboard.vk_codes["tab"])
-    Keyboard.releaseKey(Keyboard.vk_codes["tab"])
-    time.sleep(2)
-    Keyboard.releaseKey(Keyboard.vk_codes["alt"])
+    Keyboard.runMacro("+alt tab @2s -alt")
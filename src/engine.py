@@ -0,0 +1,741 @@
+import ctypes
+import heapq
+import itertools
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from enum import Enum
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from typing import *
+
+from controller import Keyboard
+
+# A day, longer would only be a way to turn it off and Windows caps lock waits at about 49 days
+MAX_INTERVAL: int = 86400
+
+
+class IdleSource:
+  """
+  Reports how long the machine has gone without any user input
+  """
+
+  def idle_time(this: Self) -> float:
+    raise NotImplementedError
+
+
+class Win32IdleSource(IdleSource):
+
+  class LASTINPUTINFO(ctypes.Structure):
+    _fields_: list = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_uint)]
+
+  def __init__(this: Self) -> None:
+    this.info: Win32IdleSource.LASTINPUTINFO = Win32IdleSource.LASTINPUTINFO()
+    this.info.cbSize = ctypes.sizeof(this.info)
+
+  def idle_time(this: Self) -> float:
+    ctypes.windll.user32.GetLastInputInfo(ctypes.byref(this.info))
+    # Both are 32 bit tick counts, so the difference has to wrap too
+    ticks: int = ctypes.windll.kernel32.GetTickCount() & 0xFFFFFFFF
+    return ((ticks - this.info.dwTime) & 0xFFFFFFFF) / 1000
+
+
+class IdleGate:
+  """
+  Holds injections back until the machine has been idle for threshold
+  seconds, minus a small lead so the input lands just before it does
+  """
+
+  def __init__(this: Self, source: IdleSource, threshold: float, lead: float = 1.0) -> None:
+    this.source: IdleSource = source
+    this.threshold: float = threshold
+    this.lead: float = lead
+
+  def wait_time(this: Self) -> float:
+    # Never lead by more than half the threshold or a fresh injection would be due again at once
+    lead: float = min(this.lead, this.threshold / 2)
+    return max(0.0, this.threshold - lead - this.source.idle_time())
+
+
+class DeadlineScheduler:
+  """
+  Ticks on absolute deadlines of a monotonic clock, so the time spent
+  pressing keys and waking up never adds to the interval. Ticks missed
+  while the PC was asleep follow the policy:
+    skip: drop them, fire once and carry on
+    catch_up: fire once more for all of them together
+    fire_all: fire once for every missed tick
+  """
+  SKIP: str = "skip"
+  CATCH_UP: str = "catch_up"
+  FIRE_ALL: str = "fire_all"
+  POLICIES: tuple[str, ...] = (SKIP, CATCH_UP, FIRE_ALL)
+
+  def __init__(this: Self, interval: float, policy: str = SKIP, clock: Callable[[], float] = time.monotonic,
+               history: int = 256) -> None:
+    if policy not in DeadlineScheduler.POLICIES:
+      raise ValueError(f"Unknown missed tick policy: {policy}")
+    this.interval: float = interval
+    this.policy: str = policy
+    this.clock: Callable[[], float] = clock
+    this.deadline: float = clock() + interval
+    # How late each tick fired, in seconds, newest last
+    this.lateness: deque[float] = deque(maxlen=history)
+
+  def reset(this: Self) -> None:
+    this.deadline: float = this.clock() + this.interval
+
+  def set_interval(this: Self, interval: float) -> None:
+    # Keep the last tick as the anchor so the change applies to the current wait, but
+    # never behind now, or shrinking it would show up as ticks missed in the meantime
+    this.deadline = max(this.deadline + interval - this.interval, this.clock())
+    this.interval: float = interval
+
+  def time_left(this: Self) -> float:
+    return this.deadline - this.clock()
+
+  def poll(this: Self) -> int:
+    # Returns how many times to fire right now and moves on to the next deadline
+    late: float = this.clock() - this.deadline
+    if late < 0:
+      return 0
+    missed: int = int(late // this.interval)
+    this.deadline += (missed + 1) * this.interval
+    this.lateness.append(late)
+    if Keyboard.metrics is not None:
+      Keyboard.metrics.observe("scheduler_lateness_seconds", late)
+    if this.policy == DeadlineScheduler.FIRE_ALL:
+      return missed + 1
+    elif this.policy == DeadlineScheduler.CATCH_UP:
+      return min(missed, 1) + 1
+    return 1
+
+
+class PowerBackend:
+  """
+  Sets the calling thread's execution state like SetThreadExecutionState
+  """
+
+  def set_state(this: Self, flags: int) -> int:
+    raise NotImplementedError
+
+
+class Win32PowerBackend(PowerBackend):
+
+  def set_state(this: Self, flags: int) -> int:
+    return ctypes.windll.kernel32.SetThreadExecutionState(flags)
+
+
+class FakePowerBackend(PowerBackend):
+  """
+  Remembers every request instead of making it, for tests
+  """
+
+  def __init__(this: Self) -> None:
+    this.requests: list[int] = []
+    this.state: int = PowerStrategy.ES_CONTINUOUS
+
+  def set_state(this: Self, flags: int) -> int:
+    this.requests.append(flags)
+    previous: int = this.state
+    this.state = flags
+    return previous
+
+
+class Strategy:
+  """
+  How Program keeps the PC awake, acquire and release are called from
+  the worker thread as it starts running and stops (or pauses), tick is
+  called on every interval if the strategy needs one
+  """
+  ticks: bool = True
+
+  def acquire(this: Self) -> None:
+    pass
+
+  def tick(this: Self) -> None:
+    pass
+
+  def release(this: Self) -> None:
+    pass
+
+
+class KeyPressStrategy(Strategy):
+
+  def __init__(this: Self, key: int) -> None:
+    this.key: int = key
+
+  def tick(this: Self) -> None:
+    Keyboard.pressAndReleaseKey(this.key)
+
+
+class MouseNudgeStrategy(Strategy):
+  """
+  Sends a relative mouse move pair that ends where it started, for apps
+  where even an F15 press does something
+  """
+
+  def __init__(this: Self, distance: int = 0) -> None:
+    this.distance: int = distance
+
+  def tick(this: Self) -> None:
+    Keyboard.nudgeMouse(this.distance)
+
+
+class PowerStrategy(Strategy):
+  """
+  Holds an execution state request for as long as the program runs, so
+  nothing is ever injected into the input stack
+  """
+  ticks: bool = False
+  ES_CONTINUOUS: int = 0x80000000
+  ES_SYSTEM_REQUIRED: int = 0x00000001
+  ES_DISPLAY_REQUIRED: int = 0x00000002
+
+  def __init__(this: Self, display: bool = True, backend: PowerBackend | None = None) -> None:
+    this.backend: PowerBackend = backend or Win32PowerBackend()
+    this.flags: int = PowerStrategy.ES_CONTINUOUS | PowerStrategy.ES_SYSTEM_REQUIRED
+    if display:
+      this.flags |= PowerStrategy.ES_DISPLAY_REQUIRED
+    this.held: bool = False
+
+  def acquire(this: Self) -> None:
+    if not this.held:
+      this.backend.set_state(this.flags)
+      this.held = True
+
+  def release(this: Self) -> None:
+    if this.held:
+      this.backend.set_state(PowerStrategy.ES_CONTINUOUS)
+      this.held = False
+
+
+class Job:
+  """
+  One thing Program does on its own schedule, like pressing a key,
+  clicking, scrolling or typing some text
+  """
+
+  def __init__(this: Self, name: str, action: Callable[[], Any], schedule: DeadlineScheduler,
+               gate: IdleGate | None = None) -> None:
+    this.name: str = name
+    this.action: Callable[[], Any] = action
+    this.schedule: DeadlineScheduler = schedule
+    this.gate: IdleGate | None = gate
+    this.runs: int = 0
+    this.cancelled: bool = False
+
+  @staticmethod
+  def parse(spec: str, policy: str = DeadlineScheduler.SKIP) -> Optional["Job"]:
+    # KIND:ARGUMENT@SECONDS, EX: key:f13@240, click:left_mouse@600, nudge:1@600, scroll:down@60, type:hi@900
+    if ":" not in spec or "@" not in spec:
+      return None
+    body, _, seconds = spec.rpartition("@")
+    kind, _, argument = body.partition(":")
+    if not seconds.isdigit() or not 1 <= int(seconds) <= MAX_INTERVAL:
+      return None
+    action: Callable[[], Any]
+    if kind == "key" and argument.lower() in Keyboard.vk_codes:
+      key: Keyboard.KeyHandle = Keyboard.resolve(argument.lower())
+      action = lambda: Keyboard.pressAndReleaseKey(key)
+    elif kind == "click" and Keyboard.vk_codes.get(argument) in Keyboard.mouse_vks:
+      action = lambda: Keyboard.pressAndReleaseMouse(argument)
+    elif kind == "nudge" and argument.isdigit():
+      action = lambda: Keyboard.nudgeMouse(int(argument))
+    elif kind == "scroll" and argument in ("up", "down", "left", "right"):
+      action = lambda: Keyboard.scrollMouse(argument, 1)
+    elif kind == "type" and argument and all(char in Keyboard.index.chars for char in argument):
+      # Checked here, otherwise every tick would only print the same error
+      action = lambda: Keyboard.keyboardWrite(argument)
+    else:
+      return None
+    return Job(spec, action, DeadlineScheduler(int(seconds), policy))
+
+
+class JobScheduler:
+  """
+  Keeps every job in a min-heap ordered by deadline, so a single thread
+  with a single timed wait can run any number of them
+  """
+
+  def __init__(this: Self, clock: Callable[[], float] = time.monotonic) -> None:
+    this.clock: Callable[[], float] = clock
+    this.heap: list[tuple[float, int, Job]] = []
+    # Breaks ties between equal deadlines so jobs themselves are never compared
+    this.order: Iterator[int] = itertools.count()
+
+  def __len__(this: Self) -> int:
+    return len(this.heap)
+
+  def add(this: Self, job: Job) -> None:
+    heapq.heappush(this.heap, (job.schedule.deadline, next(this.order), job))
+
+  def remove(this: Self, job: Job) -> None:
+    # Dropped lazily the next time it reaches the top of the heap
+    job.cancelled = True
+
+  def refresh(this: Self) -> None:
+    # Call after changing a deadline in place, EX: a new interval
+    this.heap = [(job.schedule.deadline, order, job) for _, order, job in this.heap if not job.cancelled]
+    heapq.heapify(this.heap)
+
+  def reset(this: Self) -> None:
+    for _, _, job in this.heap:
+      job.schedule.reset()
+    this.refresh()
+
+  def time_left(this: Self) -> float | None:
+    while this.heap and this.heap[0][2].cancelled:
+      heapq.heappop(this.heap)
+    if not this.heap:
+      return None
+    return this.heap[0][0] - this.clock()
+
+  def pop_due(this: Self) -> list[tuple[Job, int]]:
+    # Returns every job that is due with how many times to run it
+    due: list[tuple[Job, int]] = []
+    now: float = this.clock()
+    while this.heap and this.heap[0][0] <= now:
+      _, order, job = heapq.heappop(this.heap)
+      if job.cancelled:
+        continue
+      if job.gate is not None:
+        hold: float = job.gate.wait_time()
+        if hold > 0:
+          # Someone used the PC, that already keeps it awake
+          job.schedule.deadline = now + hold
+        else:
+          job.schedule.reset()
+          due.append((job, 1))
+      else:
+        due.append((job, job.schedule.poll()))
+      heapq.heappush(this.heap, (job.schedule.deadline, order, job))
+    return due
+
+
+IPC_AUTHKEY: bytes = b"keyboard-cat"
+
+
+def ipc_address() -> str:
+  # A named pipe on Windows, a Unix socket anywhere else so the channel can be tried off Windows
+  if sys.platform == "win32":
+    return r"\\.\pipe\keyboard-cat"
+  return os.path.join(tempfile.gettempdir(), "keyboard-cat.sock")
+
+
+def send_command(message: dict[str, Any], address: str | None = None, timeout: float = 2.0) -> dict[str, Any]:
+  # Sends one message to the running instance and returns its reply, raises OSError if nothing is listening
+  with Client(address or ipc_address(), authkey=IPC_AUTHKEY) as connection:
+    connection.send_bytes(json.dumps(message).encode())
+    if not connection.poll(timeout):
+      raise TimeoutError("The running instance did not answer")
+    return json.loads(connection.recv_bytes(4096))
+
+
+class CommandServer:
+  """
+  Lets later launches change the running instance instead of restarting
+  it, each connection sends one JSON object with any of key, interval
+  and command (pause, resume or quit) and gets one back
+  """
+  COMMANDS: tuple[str, ...] = ("pause", "resume", "quit", "metrics")
+
+  def __init__(this: Self, program: "Engine", address: str | None = None) -> None:
+    this.program: Engine = program
+    this.address: str = address or ipc_address()
+    this.listener: Listener | None = None
+
+  def start(this: Self) -> None:
+    if sys.platform != "win32" and os.path.exists(this.address):
+      # Left behind by an instance that did not exit cleanly
+      os.unlink(this.address)
+    this.listener = Listener(this.address, authkey=IPC_AUTHKEY)
+    threading.Thread(target=this.serve, daemon=True).start()
+
+  def stop(this: Self) -> None:
+    listener: Listener | None = this.listener
+    this.listener = None
+    if listener is not None:
+      listener.close()
+
+  def serve(this: Self) -> None:
+    while this.listener is not None:
+      try:
+        connection = this.listener.accept()
+      except (OSError, EOFError, AuthenticationError):
+        continue
+      with connection:
+        try:
+          # JSON rather than pickle, the authkey is no secret
+          message: Any = json.loads(connection.recv_bytes(4096))
+        except (OSError, EOFError, ValueError):
+          continue
+        try:
+          reply: dict[str, Any] = this.handle(message)
+        except Exception as e:
+          # One failing command must never take the server thread down with it
+          reply = {"ok": False, "error": f"Command failed: {e}."}
+        try:
+          connection.send_bytes(json.dumps(reply).encode())
+        except (OSError, EOFError):
+          pass
+
+  def handle(this: Self, message: Any) -> dict[str, Any]:
+    # Checks everything before changing anything, so a bad message changes nothing
+    if not isinstance(message, dict):
+      return {"ok": False, "error": "Message is not an object."}
+    key: Any = message.get("key")
+    interval: Any = message.get("interval")
+    command: Any = message.get("command")
+    if key is not None and (not isinstance(key, str) or key.lower() not in Keyboard.vk_codes):
+      return {"ok": False, "error": "Invalid key specified."}
+    # bool is an int too, but true is no interval
+    if interval is not None and (not isinstance(interval, int) or isinstance(interval, bool) or interval < 1):
+      return {"ok": False, "error": "Specified interval is less than one."}
+    if interval is not None and interval > MAX_INTERVAL:
+      return {"ok": False, "error": f"Specified interval is more than {MAX_INTERVAL} seconds."}
+    if command is not None and command not in CommandServer.COMMANDS:
+      return {"ok": False, "error": "Invalid command specified."}
+    # Only ever the path given at startup, anyone with the authkey could name any other file
+    metrics_path: str | None = this.program.metrics_path
+    if command == "metrics" and (Keyboard.metrics is None or metrics_path is None):
+      return {"ok": False, "error": "Metrics are off, start Keyboard Cat with --metrics to turn them on."}
+    if key is not None:
+      this.program.set_key(key)
+    if interval is not None:
+      this.program.set_interval(interval)
+    if command == "pause":
+      this.program.pause()
+    elif command == "resume":
+      this.program.resume()
+    elif command == "quit":
+      this.program.quit()
+    elif command == "metrics":
+      try:
+        Keyboard.metrics.export(metrics_path)
+      except OSError:
+        return {"ok": False, "error": f"Could not write metrics to {metrics_path}."}
+      return {"ok": True, "state": this.program.state.value, "metrics": metrics_path}
+    return {"ok": True, "state": this.program.state.value}
+
+
+class StatusBlock:
+  """
+  A fixed layout status record in named shared memory, so monitors can
+  poll it without a round trip to the process. It is a seqlock: the
+  writer makes seq odd, writes, then makes it even again, and readers
+  only keep a copy that had the same even seq before and after
+  """
+  NAME: str = "keyboard-cat-status"
+  VERSION: int = 2
+  # seq, version, pid, state, key, interval, last fire, next deadline, injected, failures
+  LAYOUT: struct.Struct = struct.Struct("<QIIIIQddQQ")
+  SEQ: struct.Struct = struct.Struct("<Q")
+  STATES: tuple[str, ...] = ("running", "paused", "stopping")
+
+  def __init__(this: Self, name: str = NAME, create: bool = True) -> None:
+    this.name: str = name
+    this.create: bool = create
+    this.seq: int = 0
+    this.lock: threading.Lock = threading.Lock()
+    this.map: mmap.mmap | None = StatusBlock.open_map(name, create)
+
+  @staticmethod
+  def location(name: str) -> str:
+    # Off Windows a file in /dev/shm stands in for the named mapping
+    base: str = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, name)
+
+  @staticmethod
+  def open_map(name: str, create: bool) -> mmap.mmap | None:
+    size: int = StatusBlock.LAYOUT.size
+    if sys.platform == "win32":
+      # Lives as long as any handle to it, an unwritten one reads as version 0
+      return mmap.mmap(-1, size, tagname=f"Local\\{name}")
+    if create:
+      with open(StatusBlock.location(name), "w+b") as file:
+        file.truncate(size)
+        return mmap.mmap(file.fileno(), size)
+    try:
+      with open(StatusBlock.location(name), "rb") as file:
+        return mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+      return None
+
+  def publish(this: Self, state: str, key: int, interval: int, last_fire: float, next_deadline: float,
+              injected: int, failures: int) -> None:
+    with this.lock:
+      # Packed before seq moves, a value that doesn't fit raises with the block untouched
+      data: bytes = StatusBlock.LAYOUT.pack(this.seq + 1, StatusBlock.VERSION, os.getpid(),
+                                            StatusBlock.STATES.index(state), key, interval, last_fire,
+                                            next_deadline, injected, failures)
+      this.seq += 1
+      try:
+        StatusBlock.SEQ.pack_into(this.map, 0, this.seq)
+        this.write(data)
+      finally:
+        # Readers must never be left waiting on an odd seq
+        this.seq += 1
+        StatusBlock.SEQ.pack_into(this.map, 0, this.seq)
+
+  def write(this: Self, data: bytes) -> None:
+    # Call with seq odd, everything after it in one copy
+    this.map[StatusBlock.SEQ.size:len(data)] = data[StatusBlock.SEQ.size:]
+
+  def read(this: Self, retries: int = 1000) -> dict[str, Any] | None:
+    # None if nothing was ever published or every try raced a write
+    if this.map is None:
+      return None
+    for _ in range(retries):
+      before: int = StatusBlock.SEQ.unpack_from(this.map)[0]
+      data: bytes = this.map[:StatusBlock.LAYOUT.size]
+      if before & 1 or StatusBlock.SEQ.unpack_from(this.map)[0] != before:
+        continue
+      seq, version, pid, state, key, interval, last_fire, next_deadline, injected, failures = \
+        StatusBlock.LAYOUT.unpack(data)
+      if version != StatusBlock.VERSION:
+        return None
+      return {
+        "seq": seq, "pid": pid, "state": StatusBlock.STATES[state],
+        "key": Keyboard.index.name_of.get(key, hex(key)), "interval": interval,
+        "last_fire": last_fire, "next_deadline": next_deadline, "injected": injected, "failures": failures
+      }
+    return None
+
+  def close(this: Self) -> None:
+    with this.lock:
+      if this.map is not None:
+        this.map.close()
+        this.map = None
+        if this.create and sys.platform != "win32":
+          os.unlink(StatusBlock.location(this.name))
+
+
+def read_status(name: str = StatusBlock.NAME) -> dict[str, Any] | None:
+  # One-off read, pollers should keep a StatusBlock(create=False) open and call read on it
+  block: StatusBlock = StatusBlock(name, create=False)
+  try:
+    return block.read()
+  finally:
+    block.close()
+
+
+class State(Enum):
+  RUNNING = "running"
+  PAUSED = "paused"
+  STOPPING = "stopping"
+
+
+class Engine:
+  """
+  Everything Program does apart from the command line and the tray icon,
+  so the scheduling can be driven with fake clocks, idle sources and
+  backends off Windows
+  """
+
+  def __init__(this: Self, key: str, interval: int, strategy: Strategy, paused: bool = False,
+               missed: str = DeadlineScheduler.SKIP, idle_source: IdleSource | None = None,
+               jobs: Iterable[Job] = (), use_asyncio: bool = False,
+               clock: Callable[[], float] = time.monotonic) -> None:
+    this.state: State = State.PAUSED if paused else State.RUNNING
+    # Every state or interval change notifies this, the worker never polls
+    this.condition: threading.Condition = threading.Condition()
+    this.listeners: list[Callable[[], Any]] = []
+    this.use_asyncio: bool = use_asyncio
+    this.rest_time: int = interval
+    this.key: int = Keyboard.vk_codes[key]
+    this.injected: int = 0
+    this.failures: int = 0
+    this.last_fire: float = 0.0
+    this.wakeups: int = 0
+    this.server: CommandServer | None = None
+    this.status: StatusBlock | None = None
+    this.metrics_path: str | None = None
+    this.idle_gate: IdleGate | None = IdleGate(idle_source, interval) if idle_source is not None else None
+    this.strategy: Strategy = strategy
+    this.main_job: Job = Job(key, lambda: this.strategy.tick(),
+                             DeadlineScheduler(interval, missed, clock), this.idle_gate)
+    this.jobs: JobScheduler = JobScheduler(clock)
+    for job in [this.main_job, *jobs]:
+      if job is not this.main_job or this.strategy.ticks:
+        this.jobs.add(job)
+
+  def start_services(this: Self, address: str | None = None, status_name: str = StatusBlock.NAME) -> None:
+    # Only listen once everything the commands touch exists
+    this.server = CommandServer(this, address)
+    this.server.start()
+    this.status = StatusBlock(status_name)
+    with this.condition:
+      this.publish_status()
+
+  @property
+  def paused(this: Self) -> bool:
+    return this.state is State.PAUSED
+
+  def start(this: Self) -> None:
+    if this.use_asyncio:
+      # Only imported when asked for, it is slow to load and most runs never use it
+      import asyncio
+      asyncio.run(this.proc_async())
+    else:
+      this.proc()
+
+  def pause(this: Self) -> None:
+    this.transition(State.PAUSED)
+
+  def resume(this: Self) -> None:
+    this.transition(State.RUNNING)
+
+  def quit(this: Self) -> None:
+    this.stop()
+
+  def stop(this: Self) -> None:
+    this.transition(State.STOPPING)
+    if this.server is not None:
+      this.server.stop()
+    with this.condition:
+      if this.status is not None:
+        this.status.close()
+        this.status = None
+    if this.metrics_path and Keyboard.metrics is not None:
+      try:
+        Keyboard.metrics.export(this.metrics_path)
+      except OSError:
+        pass
+
+  def transition(this: Self, state: State) -> None:
+    with this.condition:
+      # Stopping is final, nothing can bring the worker back from it
+      if this.state is State.STOPPING or this.state is state:
+        return
+      if state is State.RUNNING:
+        this.jobs.reset()
+      this.state: State = state
+      this.notify()
+
+  def set_key(this: Self, key: str) -> None:
+    with this.condition:
+      this.key: int = Keyboard.vk_codes[key.lower()]
+      this.main_job.name = key.lower()
+      if isinstance(this.strategy, KeyPressStrategy):
+        this.strategy.key = this.key
+      this.notify()
+
+  def set_interval(this: Self, interval: int) -> None:
+    with this.condition:
+      this.rest_time: int = interval
+      this.main_job.schedule.set_interval(interval)
+      if this.idle_gate is not None:
+        this.idle_gate.threshold = interval
+      this.jobs.refresh()
+      this.notify()
+
+  def notify(this: Self) -> None:
+    # Call with the condition held, wakes the worker whichever loop runs it
+    this.condition.notify_all()
+    for listener in this.listeners:
+      listener()
+    this.publish_status()
+
+  def publish_status(this: Self) -> None:
+    # Call with the condition held, times are wall clock so other processes can read them
+    if this.status is None:
+      return
+    wait_time: float | None = this.next_wait()
+    next_deadline: float = 0.0 if wait_time is None else time.time() + max(wait_time, 0.0)
+    this.status.publish(this.state.value, this.key, this.rest_time, this.last_fire, next_deadline,
+                        this.injected, this.failures)
+
+  def next_wait(this: Self) -> float | None:
+    # None means sleep until notified
+    if this.state is not State.RUNNING:
+      return None
+    return this.jobs.time_left()
+
+  def proc(this: Self) -> None:
+    try:
+      this.run_jobs()
+    finally:
+      this.strategy.release()
+
+  def poll(this: Self) -> tuple[float | None, list[tuple[Job, int]]] | None:
+    # Call with the condition held, returns how long to wait and what is due, or None to stop
+    if this.state is State.STOPPING:
+      return None
+    # Execution state requests belong to the worker thread, so they are made here
+    if this.state is State.RUNNING:
+      this.strategy.acquire()
+    else:
+      this.strategy.release()
+    wait_time: float | None = this.next_wait()
+    if wait_time is not None and wait_time <= 0:
+      return wait_time, this.jobs.pop_due()
+    return wait_time, []
+
+  def run_due(this: Self, due: list[tuple[Job, int]]) -> None:
+    for job, runs in due:
+      for _ in range(runs):
+        errors: int = Keyboard.error_count
+        try:
+          job.action()
+        except OSError:
+          # SendInput refuses while the secure desktop is up, try again next time
+          this.failures += 1
+          continue
+        # Keyboard reports bad input through Keyboard.error and returns None either way
+        if Keyboard.error_count != errors:
+          this.failures += 1
+          continue
+        job.runs += 1
+        this.injected += 1
+    with this.condition:
+      this.last_fire = time.time()
+      this.publish_status()
+
+  def run_jobs(this: Self) -> None:
+    while True:
+      with this.condition:
+        while True:
+          polled: tuple[float | None, list[tuple[Job, int]]] | None = this.poll()
+          if polled is None:
+            return
+          wait_time, due = polled
+          if due:
+            break
+          if wait_time is None or wait_time > 0:
+            this.condition.wait(wait_time)
+            this.wakeups += 1
+      # Run outside the lock so pause/resume never wait on user32
+      this.run_due(due)
+
+  async def proc_async(this: Self) -> None:
+    # Same loop as proc but waiting on asyncio, jobs run on the shared keyboard executor
+    import asyncio
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    changed: asyncio.Event = asyncio.Event()
+    listener: Callable[[], Any] = lambda: loop.call_soon_threadsafe(changed.set)
+    this.listeners.append(listener)
+    try:
+      while True:
+        changed.clear()
+        with this.condition:
+          polled: tuple[float | None, list[tuple[Job, int]]] | None = this.poll()
+        if polled is None:
+          return
+        wait_time, due = polled
+        if due:
+          await loop.run_in_executor(Keyboard.AsyncKeyboard.sharedExecutor(), this.run_due, due)
+        elif wait_time is None or wait_time > 0:
+          try:
+            await asyncio.wait_for(changed.wait(), wait_time)
+          except asyncio.TimeoutError:
+            pass
+          this.wakeups += 1
+    finally:
+      this.listeners.remove(listener)
+      this.strategy.release()
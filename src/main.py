@@ -3,6 +3,7 @@ import ctypes
 import os
 import sys
 import threading
+from multiprocessing.connection import AuthenticationError
 from typing import *
 
 import pystray
@@ -10,34 +11,76 @@ from PIL import Image
 from pystray import MenuItem as item
 
 from controller import Keyboard
+from engine import (MAX_INTERVAL, CommandServer, DeadlineScheduler, Engine, Job, KeyPressStrategy,
+                    MouseNudgeStrategy, PowerStrategy, Strategy, Win32IdleSource, send_command)
 
 
-class Program:
+class Program(Engine):
 
   def __init__(this: Self) -> None:
     parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Program to run with a specified key.")
-    parser.add_argument('--key', type=str, default='f15',
+    # key and interval default to None so only the ones given are sent on to a running instance
+    parser.add_argument('--key', type=str, default=None,
                         help='Key to press (EX: f12, f15, a, b, c, etc.) (default: f15)')
-    parser.add_argument('--interval', type=int, default=300,
-                        help='Time between each keystroke in seconds (default: 300)')
+    parser.add_argument('--interval', type=int, default=None,
+                        help='Time between each keystroke in seconds, at most a day (default: 300)')
     parser.add_argument('--paused', type=bool, default=False,
                         help='Will start the program paused if True (default: False)')
+    parser.add_argument('--idle', action='store_true',
+                        help='Only press the key once the PC has been idle for the interval (default: off)')
+    parser.add_argument('--missed', type=str, default=DeadlineScheduler.SKIP, choices=DeadlineScheduler.POLICIES,
+                        help='What to do with keystrokes missed while the PC slept (default: skip)')
+    parser.add_argument('--strategy', type=str, default='key', choices=['key', 'mouse', 'power', 'display'],
+                        help='key presses --key, mouse nudges the mouse in place, power keeps the PC awake and '
+                             'display also keeps the screen on without sending any input (default: key)')
+    parser.add_argument('--asyncio', action='store_true',
+                        help='Run the jobs on an asyncio event loop instead of a plain thread (default: off)')
+    parser.add_argument('--job', type=str, action='append', default=[],
+                        help='Extra job as KIND:ARGUMENT@SECONDS, kinds are key, click, nudge, scroll and type '
+                             '(EX: --job key:f13@240 --job scroll:down@600), can be repeated')
+    parser.add_argument('--command', type=str, default=None, choices=CommandServer.COMMANDS,
+                        help='Pause, resume, quit or export the metrics of the instance that is already running, '
+                             '--key and --interval are sent along with it and this launch exits straight away, '
+                             'metrics always go to the --metrics path that instance was started with (default: none)')
+    parser.add_argument('--metrics', type=str, default=None,
+                        help='Collect send and scheduler metrics and write them to this file on quit or on '
+                             '--command metrics, as JSON if it ends in .json else Prometheus text (default: off)')
     args: argparse.Namespace = parser.parse_args()
-    if args.key.lower() not in Keyboard.vk_codes:
+    key: str = (args.key or 'f15').lower()
+    interval: int = 300 if args.interval is None else args.interval
+    if key not in Keyboard.vk_codes:
       ctypes.windll.user32.MessageBoxW(0, "Invalid key specified.", "Error", 0x10)
       sys.exit(0)
-    elif args.interval < 1:
+    elif interval < 1:
       ctypes.windll.user32.MessageBoxW(0, "Specified interval is less than one.", "Error", 0x10)
       sys.exit(0)
+    elif interval > MAX_INTERVAL:
+      ctypes.windll.user32.MessageBoxW(0, f"Specified interval is more than {MAX_INTERVAL} seconds.", "Error", 0x10)
+      sys.exit(0)
+    extra_jobs: list[Job | None] = [Job.parse(spec, args.missed) for spec in args.job]
+    if None in extra_jobs:
+      ctypes.windll.user32.MessageBoxW(0, "Invalid job specified.", "Error", 0x10)
+      sys.exit(0)
+
+    # Prevent multiple instances of the program, a second launch hands its arguments over and exits
+    this.prevent_multiple_instance({"key": args.key, "interval": args.interval, "command": args.command})
+    if args.command == "quit":
+      sys.exit(0)
 
-    this.loop: bool = True
-    this.paused: bool = args.paused
-    this.rest_time: int = args.interval
-    this.key: int = Keyboard.vk_codes[args.key.lower()]
-    this.stop_event: threading.Event = threading.Event()
-    this.cancel_token: threading.Event = threading.Event()
-    # Prevent multiple instances of the program
-    this.prevent_multiple_instance()
+    vk: int = Keyboard.vk_codes[key]
+    strategy: Strategy
+    if args.strategy in ('power', 'display'):
+      strategy = PowerStrategy(display=args.strategy == 'display')
+    elif args.strategy == 'mouse':
+      strategy = MouseNudgeStrategy()
+    else:
+      strategy = KeyPressStrategy(vk)
+    super().__init__(key, interval, strategy, paused=args.paused or args.command == "pause", missed=args.missed,
+                     idle_source=Win32IdleSource() if args.idle else None, jobs=extra_jobs,
+                     use_asyncio=args.asyncio)
+    this.metrics_path = args.metrics
+    if args.metrics:
+      Keyboard.enableMetrics(True)
     message_thread: threading.Thread = threading.Thread(
       target=lambda: ctypes.windll.user32.MessageBoxW(0,
                                                       "Keyboard Cat is now running in your system tray, right click it to learn more.",
@@ -45,77 +88,67 @@ class Program:
                                                       0x40))
     message_thread.start()
 
-  def prevent_multiple_instance(this: Self) -> None:
+  def prevent_multiple_instance(this: Self, message: dict[str, Any]) -> None:
     # Create a mutex and check if it already exists
     mutex_name: str = "keyboard-cat"
     ctypes.windll.kernel32.CreateMutexW(None, False, mutex_name)
     last_error: int = ctypes.windll.kernel32.GetLastError()
     ERROR_ALREADY_EXISTS: int = 183
     if last_error == ERROR_ALREADY_EXISTS:
-      ctypes.windll.user32.MessageBoxW(0, "Another instance is already running.", "Error", 0x10)
+      if all(value is None for value in message.values()):
+        ctypes.windll.user32.MessageBoxW(0, "Another instance is already running.", "Error", 0x10)
+        sys.exit(0)
+      # Forward whatever was given, the running instance does the work
+      try:
+        reply: dict[str, Any] = send_command(message)
+      except (OSError, EOFError, AuthenticationError, ValueError):
+        reply = {"ok": False, "error": "Another instance is already running."}
+      if not reply.get("ok"):
+        ctypes.windll.user32.MessageBoxW(0, reply.get("error", "Another instance is already running."), "Error", 0x10)
       sys.exit(0)
 
   def get_resource_path(this: Self, relative_path: str) -> str:
     base_path: str = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
 
-  def start(this: Self) -> None:
-    this.cancel_token.clear()
-    this.proc()
-
-  def stop(this: Self) -> None:
-    this.loop: bool = False
-    this.stop_event.set()
-    this.cancel_token.set()
-
-  def proc(this: Self) -> None:
-    pause_event: threading.Event = threading.Event()
-    while this.loop:
-      if not this.paused:
-        pause_event.set()
-        if this.cancel_token.wait(this.rest_time):
-          break
-        Keyboard.pressAndReleaseKey(this.key)
-      else:
-        pause_event.clear()
-        while this.paused and this.loop:
-          if this.cancel_token.wait(10):
-            break
-      if this.cancel_token.is_set():
-        break
-
   def create_menu(this: Self) -> pystray.Menu:
     if this.paused:
       return pystray.Menu(
+        item(lambda _: f"Keystrokes sent: {this.injected}", None, enabled=False),
         item("Resume", lambda: this.resume()),
         item("Quit", lambda: this.on_quit(icon)),
       )
     else:
       return pystray.Menu(
+        item(lambda _: f"Keystrokes sent: {this.injected}", None, enabled=False),
         item("Pause", lambda: this.pause()),
         item("Quit", lambda: this.on_quit(icon)),
       )
 
   def pause(this: Self) -> None:
-    this.paused: bool = True
+    super().pause()
     icon.menu = this.create_menu()
 
   def resume(this: Self) -> None:
-    this.paused: bool = False
+    super().resume()
     icon.menu = this.create_menu()
 
+  def quit(this: Self) -> None:
+    this.on_quit(icon)
+
   def on_quit(this: Self, icon: pystray.Icon) -> None:
     icon.stop()
     this.stop()
 
 
-program: Program = Program()
-icon_path: str = program.get_resource_path("icon.ico")
-image: Image.Image = Image.open(icon_path)
-image: Image.Image = image.resize((64, 64))
-icon: pystray.Icon = pystray.Icon("Keyboard Cat", image)
-icon.menu = program.create_menu()
-
 if __name__ == "__main__":
+  program: Program = Program()
+  icon_path: str = program.get_resource_path("icon.ico")
+  image: Image.Image = Image.open(icon_path)
+  image: Image.Image = image.resize((64, 64))
+  icon: pystray.Icon = pystray.Icon("Keyboard Cat", image)
+  icon.menu = program.create_menu()
+  # Commands pause, resume and quit through the icon, so it has to exist before they can arrive
+  program.start_services()
   threading.Thread(target=program.start).start()
   icon.run()
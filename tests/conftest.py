@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from controller import Keyboard  # noqa: E402
+
+
+class FakeClock:
+  """
+  A monotonic clock that only moves when told to
+  """
+
+  def __init__(self, now: float = 0.0) -> None:
+    self.now: float = now
+
+  def __call__(self) -> float:
+    return self.now
+
+  def advance(self, seconds: float) -> None:
+    self.now += seconds
+
+
+def poll(predicate, timeout: float = 2.0) -> float:
+  # Returns how long it took, fails the test if it never happened
+  start: float = time.perf_counter()
+  while not predicate():
+    assert time.perf_counter() - start < timeout
+    time.sleep(0.0005)
+  return time.perf_counter() - start
+
+
+@pytest.fixture
+def wait_for():
+  # Shared through a fixture so test modules never import each other
+  return poll
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+  return FakeClock()
+
+
+@pytest.fixture
+def recording():
+  # Every test gets a fresh recording backend and leaves no global state behind
+  backend = Keyboard.RecordingBackend()
+  Keyboard.setBackend(backend)
+  yield backend
+  Keyboard.setBackend(None)
+  Keyboard.rate_limiter = None
+  Keyboard.metrics = None
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import selectors
+import subprocess
+import sys
+
+import pytest
+
+from controller import Keyboard
+from engine import Engine, KeyPressStrategy
+
+
+class VirtualSelector(selectors.DefaultSelector):
+  """
+  Jumps the clock forward instead of blocking on a timeout, but really
+  waits while executor work is in flight so sends happen at the time
+  they were made, not at the next timer
+  """
+
+  def __init__(self, clock) -> None:
+    super().__init__()
+    self.clock = clock
+    self.busy: int = 0
+
+  def select(self, timeout: float | None = None):
+    events = super().select(0)
+    if events or timeout == 0:
+      return events
+    if timeout is None or self.busy:
+      return super().select(None)
+    self.clock.advance(timeout)
+    return []
+
+
+class VirtualLoop(asyncio.SelectorEventLoop):
+
+  def __init__(self, clock) -> None:
+    self.virtual = VirtualSelector(clock)
+    super().__init__(self.virtual)
+    self.clock = clock
+
+  def time(self) -> float:
+    return self.clock()
+
+  def run_in_executor(self, executor, function, *args):
+    self.virtual.busy += 1
+
+    def done(future) -> None:
+      self.virtual.busy -= 1
+    future = super().run_in_executor(executor, function, *args)
+    future.add_done_callback(done)
+    return future
+
+
+def run(clock, coroutine):
+  loop = VirtualLoop(clock)
+  try:
+    return loop.run_until_complete(coroutine)
+  finally:
+    loop.close()
+
+
+class TimedBackend(Keyboard.RecordingBackend):
+  """
+  Notes the virtual time of every send
+  """
+
+  def __init__(self, clock) -> None:
+    super().__init__()
+    self.clock = clock
+    self.times: list[float] = []
+
+  def sendInput(self, count, inputs, size):
+    self.times.append(self.clock())
+    return super().sendInput(count, inputs, size)
+
+
+@pytest.mark.parametrize("module", ["controller", "engine"])
+def test_importing_does_not_import_asyncio(module):
+  code: str = f"import sys, {module}; print('asyncio' in sys.modules, 'concurrent.futures' in sys.modules)"
+  output: str = subprocess.run(
+    [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+    cwd=os.path.dirname(sys.modules["controller"].__file__)
+  ).stdout
+  assert output.split() == ["False", "False"]
+
+
+@pytest.mark.parametrize("cps", [0, -4, True, "4", float("nan")])
+def test_type_rejects_bad_rates(recording, clock, capsys, cps):
+  assert run(clock, Keyboard.AsyncKeyboard().type("abcd", cps=cps)) is Keyboard.exit_code
+  assert "Given variable cps is not a positive number" in capsys.readouterr().out
+  assert recording.calls == 0
+
+
+def test_type_keeps_to_its_schedule(recording, clock):
+  backend = TimedBackend(clock)
+  Keyboard.setBackend(backend)
+  run(clock, Keyboard.AsyncKeyboard().type("abcd", cps=4))
+  # Nothing is held at the end, so the restore sends nothing
+  assert backend.times == [0.0, 0.25, 0.5, 0.75]
+  assert [vk for vk, flags in backend.keys() if not flags & Keyboard.KEYEVENTF_KEYUP] == [0x41, 0x42, 0x43, 0x44]
+
+
+def test_cancelled_type_releases_what_it_holds(recording, clock):
+  backend = TimedBackend(clock)
+  Keyboard.setBackend(backend)
+
+  async def cancel_midway() -> None:
+    task = asyncio.ensure_future(Keyboard.AsyncKeyboard().type("aBCd", cps=1))
+    await asyncio.sleep(1.5)
+    task.cancel()
+    try:
+      await task
+    except asyncio.CancelledError:
+      pass
+
+  run(clock, cancel_midway())
+  # Shift was still down from "B" when the cleanup went out at 1.5
+  assert backend.times == [0.0, 1.0, 1.5]
+  assert backend.down == set()
+
+
+def test_run_macro_awaits_its_waits(recording, clock):
+  backend = TimedBackend(clock)
+  Keyboard.setBackend(backend)
+  run(clock, Keyboard.AsyncKeyboard().runMacro('"a" @2s tab @250ms "b"'))
+  assert backend.times == [0.0, 2.0, 2.25]
+  assert backend.down == set()
+
+
+def test_proc_async_fires_on_virtual_time(recording, clock):
+  engine = Engine("f15", 300, KeyPressStrategy(Keyboard.vk_codes["f15"]), clock=clock)
+  fired: list[float] = []
+
+  def tick() -> None:
+    fired.append(clock())
+    if len(fired) == 3:
+      engine.stop()
+
+  engine.strategy.tick = tick
+  engine.state = engine.state.RUNNING
+  run(clock, engine.proc_async())
+  assert fired == [300.0, 600.0, 900.0]
+  # One timed-out wait per tick and nothing else
+  assert engine.wakeups == 3
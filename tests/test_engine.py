@@ -0,0 +1,93 @@
+import threading
+import time
+
+from controller import Keyboard
+from engine import Engine, KeyPressStrategy, State
+
+
+class TracingStrategy(KeyPressStrategy):
+  """
+  Signals every acquire and release so the test can wait on the worker
+  """
+
+  def __init__(self, key: int) -> None:
+    super().__init__(key)
+    self.acquired: threading.Event = threading.Event()
+    self.released: threading.Event = threading.Event()
+
+  def acquire(self) -> None:
+    self.acquired.set()
+
+  def release(self) -> None:
+    self.released.set()
+
+
+def start_engine(clock) -> tuple[Engine, TracingStrategy, threading.Thread]:
+  strategy = TracingStrategy(Keyboard.vk_codes["f15"])
+  engine = Engine("f15", 300, strategy, clock=clock)
+  worker = threading.Thread(target=engine.start, daemon=True)
+  worker.start()
+  # acquire runs with the condition held, so once it fired the worker is waiting
+  assert strategy.acquired.wait(2)
+  strategy.acquired.clear()
+  return engine, strategy, worker
+
+
+def test_transitions_wake_the_worker_once_each(recording, clock, wait_for):
+  engine, strategy, worker = start_engine(clock)
+  assert engine.wakeups == 0
+
+  start: float = time.perf_counter()
+  engine.pause()
+  assert strategy.released.wait(2)
+  assert time.perf_counter() - start < 0.1
+  assert engine.wakeups == 1
+
+  start = time.perf_counter()
+  engine.resume()
+  assert strategy.acquired.wait(2)
+  assert time.perf_counter() - start < 0.1
+  assert engine.wakeups == 2
+
+  engine.set_interval(600)
+  wait_for(lambda: engine.wakeups == 3)
+  assert engine.main_job.schedule.interval == 600
+
+  engine.stop()
+  worker.join(2)
+  assert not worker.is_alive()
+  assert engine.wakeups == 4
+  assert engine.state is State.STOPPING
+  # The clock never moved, so nothing was ever due
+  assert engine.injected == 0
+  assert recording.keys() == []
+
+
+def test_a_frozen_clock_never_spins(recording, clock):
+  engine, strategy, worker = start_engine(clock)
+  time.sleep(0.05)
+  assert engine.wakeups == 0
+  engine.stop()
+  worker.join(2)
+  assert engine.wakeups == 1
+
+
+def test_fires_when_the_deadline_passes(recording, clock, wait_for):
+  engine, strategy, worker = start_engine(clock)
+  clock.advance(300)
+  # Any notify makes the worker look at the clock again
+  engine.set_interval(300)
+  wait_for(lambda: engine.injected == 1)
+  vk: int = Keyboard.vk_codes["f15"]
+  assert recording.keys() == [(vk, 0), (vk, Keyboard.KEYEVENTF_KEYUP)]
+  engine.stop()
+  worker.join(2)
+  assert engine.injected == 1
+
+
+def test_stopping_is_final(recording, clock):
+  engine, strategy, worker = start_engine(clock)
+  engine.stop()
+  worker.join(2)
+  engine.resume()
+  assert engine.state is State.STOPPING
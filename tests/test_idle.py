@@ -0,0 +1,67 @@
+from controller import Keyboard
+from engine import Engine, IdleSource, KeyPressStrategy
+
+
+class FakeIdleSource(IdleSource):
+
+  def __init__(self) -> None:
+    self.idle: float = 0.0
+
+  def idle_time(self) -> float:
+    return self.idle
+
+
+def tick(engine: Engine) -> None:
+  # One pass of the worker loop without the waiting
+  with engine.condition:
+    _, due = engine.poll()
+  engine.run_due(due)
+
+
+def make_engine(clock, source: FakeIdleSource) -> Engine:
+  vk: int = Keyboard.vk_codes["f15"]
+  return Engine("f15", 60, KeyPressStrategy(vk), idle_source=source, clock=clock)
+
+
+def test_nothing_is_injected_while_the_machine_is_in_use(recording, clock):
+  source = FakeIdleSource()
+  engine = make_engine(clock, source)
+  for _ in range(10):
+    clock.advance(61)
+    source.idle = 5.0
+    tick(engine)
+  assert engine.injected == 0
+  assert recording.keys() == []
+
+
+def test_injects_once_idle_and_counts_it(recording, clock):
+  source = FakeIdleSource()
+  engine = make_engine(clock, source)
+  clock.advance(61)
+  source.idle = 5.0
+  tick(engine)
+  # The gate moved the deadline out to when the machine would be idle long enough
+  assert engine.injected == 0
+  left: float = engine.jobs.time_left()
+  assert left == 60 - 1 - 5
+  clock.advance(left)
+  source.idle += left
+  tick(engine)
+  vk: int = Keyboard.vk_codes["f15"]
+  assert engine.injected == 1
+  assert recording.keys() == [(vk, 0), (vk, Keyboard.KEYEVENTF_KEYUP)]
+  # Still idle, so the next interval fires on its own
+  clock.advance(60)
+  source.idle += 60
+  tick(engine)
+  assert engine.injected == 2
+  assert engine.main_job.runs == 2
+
+
+def test_not_due_yet_does_nothing(recording, clock):
+  source = FakeIdleSource()
+  source.idle = 1000.0
+  engine = make_engine(clock, source)
+  clock.advance(30)
+  tick(engine)
+  assert engine.injected == 0
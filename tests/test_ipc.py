@@ -0,0 +1,76 @@
+import os
+import statistics
+import time
+
+import pytest
+
+from controller import Keyboard
+from engine import MAX_INTERVAL, Engine, KeyPressStrategy, State, read_status, send_command
+
+
+@pytest.fixture
+def engine(recording, clock, tmp_path):
+  engine = Engine("f15", 300, KeyPressStrategy(Keyboard.vk_codes["f15"]), clock=clock)
+  engine.start_services(str(tmp_path / "kc.sock"), f"kc-test-ipc-{os.getpid()}")
+  yield engine
+  engine.stop()
+
+
+def test_round_trip_changes_the_running_instance(engine):
+  address: str = engine.server.address
+  reply = send_command({"key": "f13", "interval": 60}, address)
+  assert reply == {"ok": True, "state": "running"}
+  assert engine.strategy.key == Keyboard.vk_codes["f13"]
+  assert engine.main_job.schedule.interval == 60
+  assert send_command({"command": "pause"}, address) == {"ok": True, "state": "paused"}
+  assert engine.state is State.PAUSED
+  assert send_command({"command": "resume"}, address) == {"ok": True, "state": "running"}
+
+
+def test_round_trip_latency(engine):
+  times: list[float] = []
+  for _ in range(50):
+    start: float = time.perf_counter()
+    send_command({"command": "resume"}, engine.server.address)
+    times.append(time.perf_counter() - start)
+  # A second launch has to hand over and exit within milliseconds
+  assert statistics.median(times) < 0.01
+
+
+@pytest.mark.parametrize("message, error", [
+  ({"key": "nope", "interval": 60}, "Invalid key specified."),
+  ({"key": 15, "interval": 60}, "Invalid key specified."),
+  ({"interval": 0}, "Specified interval is less than one."),
+  ({"interval": True}, "Specified interval is less than one."),
+  ({"interval": "60"}, "Specified interval is less than one."),
+  ({"interval": MAX_INTERVAL + 1}, f"Specified interval is more than {MAX_INTERVAL} seconds."),
+  ({"interval": 5000000000}, f"Specified interval is more than {MAX_INTERVAL} seconds."),
+  ({"key": "f13", "interval": 60, "command": "reboot"}, "Invalid command specified."),
+])
+def test_bad_messages_change_nothing(engine, message, error):
+  # Valid fields ride along to prove a bad message is rejected whole
+  reply = send_command(message, engine.server.address)
+  assert reply == {"ok": False, "error": error}
+  assert engine.main_job.schedule.interval == 300
+  assert engine.strategy.key == Keyboard.vk_codes["f15"]
+
+
+def test_failing_commands_are_reported_and_the_server_survives(engine):
+  def pause() -> None:
+    raise NameError("name 'icon' is not defined")
+  engine.pause = pause
+  reply = send_command({"command": "pause"}, engine.server.address)
+  assert reply["ok"] is False
+  assert "icon" in reply["error"]
+  assert send_command({"command": "resume"}, engine.server.address)["ok"]
+
+
+def test_quit_removes_the_socket(engine):
+  address: str = engine.server.address
+  assert os.path.exists(address)
+  assert send_command({"command": "quit"}, address) == {"ok": True, "state": "stopping"}
+  assert engine.state is State.STOPPING
+  assert not os.path.exists(address)
+  assert read_status(f"kc-test-ipc-{os.getpid()}") is None
+  with pytest.raises(OSError):
+    send_command({"command": "pause"}, address)
@@ -0,0 +1,86 @@
+import pytest
+
+from controller import Keyboard
+from engine import MAX_INTERVAL, DeadlineScheduler, Engine, Job, JobScheduler, KeyPressStrategy
+
+
+@pytest.mark.parametrize("spec", [
+  "key:f13@240", "key:F13@1", "click:left_mouse@600", "nudge:1@600", "scroll:down@60", "type:Hi there!@900",
+  f"key:f13@{MAX_INTERVAL}",
+])
+def test_valid_specs(spec):
+  job = Job.parse(spec, DeadlineScheduler.CATCH_UP)
+  assert job.name == spec
+  assert job.schedule.policy == DeadlineScheduler.CATCH_UP
+  assert job.schedule.interval == int(spec.rpartition("@")[2])
+
+
+@pytest.mark.parametrize("spec", [
+  "key:f13", "f13@60", "key:nope@60", "key:f13@0", "key:f13@-5", "key:f13@1.5", f"key:f13@{MAX_INTERVAL + 1}",
+  "click:a@60", "nudge:-1@60", "scroll:sideways@60", "type:@60", "type:café@60", "type:☃@60", "reboot:now@60",
+])
+def test_invalid_specs(spec):
+  assert Job.parse(spec) is None
+
+
+def test_actions_send_what_they_say(recording):
+  Job.parse("key:f13@60").action()
+  Job.parse("type:Ab@60").action()
+  assert [vk for vk, flags in recording.keys() if not flags & Keyboard.KEYEVENTF_KEYUP] == [0x7C, 0x10, 0x41, 0x42]
+  Job.parse("click:right_mouse@60").action()
+  assert recording.events[-1].mi.dwFlags == 0x0010
+
+
+def job(name: str, interval: float, clock, runs: list[str]) -> Job:
+  return Job(name, lambda: runs.append(name), DeadlineScheduler(interval, clock=clock))
+
+
+def test_jobs_come_due_in_deadline_order(clock):
+  runs: list[str] = []
+  jobs = JobScheduler(clock)
+  for name, interval in (("c", 30), ("a", 10), ("b", 20), ("a2", 10)):
+    jobs.add(job(name, interval, clock, runs))
+  assert jobs.time_left() == 10
+  clock.advance(10)
+  # Equal deadlines keep the order they were added in
+  assert [j.name for j, n in jobs.pop_due()] == ["a", "a2"]
+  clock.advance(20)
+  # a and a2 are a whole tick behind, skip fires them once and moves them on to 40
+  assert [(j.name, n) for j, n in jobs.pop_due()] == [("a", 1), ("b", 1), ("a2", 1), ("c", 1)]
+  assert jobs.time_left() == 10 and len(jobs) == 4
+
+
+def test_removed_jobs_are_dropped_lazily(clock):
+  runs: list[str] = []
+  jobs = JobScheduler(clock)
+  first, second = job("a", 10, clock, runs), job("b", 20, clock, runs)
+  jobs.add(first)
+  jobs.add(second)
+  jobs.remove(first)
+  assert len(jobs) == 2
+  # Reaching the top of the heap is what drops it
+  assert jobs.time_left() == 20 and len(jobs) == 1
+  clock.advance(20)
+  assert [j.name for j, n in jobs.pop_due()] == ["b"]
+
+
+def test_refresh_after_a_deadline_changes(clock):
+  runs: list[str] = []
+  jobs = JobScheduler(clock)
+  slow, fast = job("slow", 100, clock, runs), job("fast", 50, clock, runs)
+  jobs.add(slow)
+  jobs.add(fast)
+  slow.schedule.set_interval(10)
+  jobs.refresh()
+  assert jobs.time_left() == 10
+  clock.advance(10)
+  assert [j.name for j, n in jobs.pop_due()] == ["slow"]
+
+
+def test_reported_errors_are_failures_not_injections(recording, clock):
+  engine = Engine("f15", 300, KeyPressStrategy(Keyboard.vk_codes["f15"]), clock=clock)
+  good = Job("good", lambda: Keyboard.pressAndReleaseKey("f13"), DeadlineScheduler(10, clock=clock))
+  bad = Job("bad", lambda: Keyboard.pressAndReleaseKey("nope"), DeadlineScheduler(10, clock=clock))
+  engine.run_due([(good, 2), (bad, 3)])
+  assert (engine.injected, engine.failures) == (2, 3)
+  assert (good.runs, bad.runs) == (2, 0)
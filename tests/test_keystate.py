@@ -0,0 +1,26 @@
+import pytest
+
+from controller import Keyboard
+
+
+def test_snapshot_reads_held_keys(recording):
+  Keyboard.pressKey("shift")
+  Keyboard.pressKey("a")
+  snapshot = Keyboard.snapshotKeys()
+  assert snapshot.isDown("a") and snapshot.isDown(0x41)
+  assert not snapshot.isDown("b")
+  assert snapshot.anyModifier()
+  assert snapshot.anyDown(["b", "shift"])
+  assert snapshot.anyDown(Keyboard.keyMask(["a"]))
+  assert not snapshot.anyDown(Keyboard.keyMask([0xA0, "b"]))
+  assert snapshot.downKeys() == [0x10, 0x41]
+
+
+@pytest.mark.parametrize("key", ["not a key", 256, -1, None, True])
+def test_unknown_keys_are_reported(recording, capsys, key):
+  snapshot = Keyboard.snapshotKeys()
+  assert snapshot.isDown(key) is Keyboard.exit_code
+  assert snapshot.isToggled(key) is Keyboard.exit_code
+  assert snapshot.anyDown(["a", key]) is Keyboard.exit_code
+  assert Keyboard.keyMask([key]) is Keyboard.exit_code
+  assert capsys.readouterr().out.count("RUNTIME - Given key code is not valid.") == 4
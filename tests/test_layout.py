@@ -0,0 +1,82 @@
+from controller import Keyboard
+
+
+class FakeUser32:
+  """
+  Just the calls keyboardLayout makes, the foreground window belongs to
+  thread 77 and every thread has its own layout
+  """
+
+  def __init__(self) -> None:
+    self.layouts: dict[int, int] = {0: 0x04090409, 77: 0x04070407}
+    self.foreground: int | None = 0x1234
+
+  def GetForegroundWindow(self):
+    return self.foreground
+
+  def GetWindowThreadProcessId(self, hwnd, process_id):
+    assert process_id is None
+    return 77 if hwnd == 0x1234 else 0
+
+  def GetKeyboardLayout(self, thread):
+    return self.layouts[thread]
+
+
+class LayoutBackend(Keyboard.RecordingBackend):
+  """
+  Every layout maps a VK to a different scan code
+  """
+
+  def __init__(self) -> None:
+    super().__init__()
+    self.layout: int = 1
+    self.mapped: int = 0
+
+  def keyboardLayout(self):
+    return self.layout
+
+  def mapVirtualKey(self, vk, layout):
+    self.mapped += 1
+    return vk + layout * 0x100
+
+
+def test_win32_backend_uses_the_foreground_threads_layout():
+  backend = Keyboard.Win32Backend()
+  backend._user32 = FakeUser32()
+  assert backend.keyboardLayout() == 0x04070407
+  # No foreground window, thread 0 means our own
+  backend._user32.foreground = None
+  assert backend.keyboardLayout() == 0x04090409
+
+
+def test_records_follow_a_layout_switch(recording, clock, monkeypatch):
+  monkeypatch.setattr(Keyboard, "scan_codes", Keyboard.ScanCodeTable(check_interval=1.0, clock=clock))
+  backend = LayoutBackend()
+  Keyboard.setBackend(backend)
+
+  def scans() -> list[int]:
+    return [event.ki.wScan for event in backend.events]
+
+  macro = Keyboard.compileMacro('"a"')
+  Keyboard.keyboardWrite("a")
+  assert scans() == [0x141, 0x141]
+  assert backend.mapped == 256
+
+  # Switched, but the layout is only checked once a second
+  backend.layout = 2
+  Keyboard.keyboardWrite("a")
+  assert scans()[2:] == [0x141, 0x141]
+  assert Keyboard.compileMacro('"a"') is macro
+
+  clock.advance(1.0)
+  Keyboard.keyboardWrite("a")
+  assert scans()[4:] == [0x241, 0x241]
+  assert Keyboard.compileMacro('"a"') is not macro
+  assert backend.mapped == 512
+
+  # Switching back reuses the table built the first time
+  backend.layout = 1
+  clock.advance(1.0)
+  Keyboard.keyboardWrite("a")
+  assert scans()[6:] == [0x141, 0x141]
+  assert backend.mapped == 512
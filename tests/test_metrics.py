@@ -0,0 +1,87 @@
+import json
+import os
+
+from controller import Keyboard
+from engine import Engine, KeyPressStrategy, send_command
+
+
+def test_samples_on_a_bound_count_under_it():
+  histogram = Keyboard.Histogram()
+  for seconds in (0.0, 1e-6, 2e-6, 2.001e-6, 3e-6, 4e-6, 1e-3):
+    histogram.observe(seconds)
+  assert histogram.buckets[:4] == [2, 1, 3, 0]
+  # 1 ms is 1000 us, over 512 and at most 1024
+  assert histogram.buckets[10] == 1
+  assert histogram.count == 7
+
+
+def test_overflow_only_counts_in_inf():
+  histogram = Keyboard.Histogram()
+  histogram.observe(8 * 3600.0)
+  histogram.observe(2 ** 31 / 1e6)
+  assert histogram.overflow == 1
+  assert histogram.buckets[-1] == 1
+  metrics = Keyboard.Metrics()
+  metrics.histograms["scheduler_lateness_seconds"] = histogram
+  text: str = metrics.toPrometheus()
+  assert 'keyboard_cat_scheduler_lateness_seconds_bucket{le="2147.483648"} 1\n' in text
+  assert 'keyboard_cat_scheduler_lateness_seconds_bucket{le="+Inf"} 2\n' in text
+  assert "keyboard_cat_scheduler_lateness_seconds_count 2\n" in text
+
+
+def test_send_path_and_errors_are_counted(recording):
+  metrics = Keyboard.enableMetrics()
+  Keyboard.pressAndReleaseKey("a")
+  Keyboard.keyboardWrite("hi")
+  Keyboard.pressKey("not a key")
+  assert metrics.calls == 2
+  assert metrics.events == recording.sent
+  assert metrics.histograms["sendinput_seconds"].count == 2
+  assert metrics.failures == {"runtime": 1}
+  assert list(metrics.errors) == ["RUNTIME - Given key code is not valid."]
+  assert Keyboard.enableMetrics(False) is None
+  Keyboard.pressAndReleaseKey("a")
+  assert metrics.calls == 2
+
+
+def test_send_failures_are_counted_and_raised(recording):
+  class Refusing(Keyboard.NullBackend):
+    def sendInput(self, count, inputs, size):
+      raise OSError(5, "Access is denied")
+  Keyboard.setBackend(Refusing())
+  metrics = Keyboard.enableMetrics()
+  try:
+    Keyboard.Raw.tap(0x41)
+  except OSError:
+    pass
+  else:
+    raise AssertionError("SendInput failure was swallowed")
+  assert metrics.failures == {"sendinput": 1}
+  assert metrics.calls == 0
+
+
+def test_export(tmp_path, recording):
+  metrics = Keyboard.enableMetrics()
+  Keyboard.pressAndReleaseKey("a")
+  metrics.export(str(tmp_path / "m.json"))
+  metrics.export(str(tmp_path / "m.prom"))
+  assert json.loads((tmp_path / "m.json").read_text())["sendinput_calls"] == 1
+  assert "keyboard_cat_sendinput_calls_total 1\n" in (tmp_path / "m.prom").read_text()
+  assert sorted(os.listdir(tmp_path)) == ["m.json", "m.prom"]
+
+
+def test_metrics_command_only_writes_the_startup_path(recording, clock, tmp_path):
+  Keyboard.enableMetrics()
+  engine = Engine("f15", 300, KeyPressStrategy(Keyboard.vk_codes["f15"]), clock=clock)
+  engine.metrics_path = str(tmp_path / "kc.prom")
+  engine.start_services(str(tmp_path / "kc.sock"), f"kc-test-metrics-{os.getpid()}")
+  try:
+    chosen: str = str(tmp_path / "attacker-chosen.txt")
+    reply = send_command({"command": "metrics", "metrics": chosen}, engine.server.address)
+    assert reply == {"ok": True, "state": "running", "metrics": engine.metrics_path}
+    assert os.path.exists(engine.metrics_path)
+    assert not os.path.exists(chosen)
+    engine.metrics_path = None
+    assert not send_command({"command": "metrics"}, engine.server.address)["ok"]
+  finally:
+    engine.stop()
@@ -0,0 +1,114 @@
+import pytest
+
+from controller import Keyboard
+
+SHIFT: int = 0x10
+
+
+@pytest.mark.parametrize("text, events", [
+  ("hello", 10),
+  ("Hello", 12),
+  ("HELLO", 12),
+  ("aBcD", 12),
+  ("ABcd", 10),
+  ("Hi!", 10),
+  ("", 0),
+])
+def test_event_counts(recording, text, events):
+  Keyboard.keyboardWrite(text)
+  assert len(recording.events) == events
+  assert recording.down == set()
+
+
+def test_shift_only_moves_when_it_has_to(recording):
+  Keyboard.keyboardWrite("ABcd")
+  assert [key for key in recording.keys() if key[0] == SHIFT] == [
+    (SHIFT, 0), (SHIFT, Keyboard.KEYEVENTF_KEYUP)
+  ]
+
+
+def test_state_skips_no_op_transitions(recording):
+  state = Keyboard.ModifierState()
+  records: list[bytes] = []
+  assert not state.set(SHIFT, False, records)
+  assert state.set(SHIFT, True, records)
+  assert not state.set(SHIFT, True, records)
+  assert state.isDown(SHIFT)
+  state.restore(records)
+  assert len(records) == 2 and not state.isDown(SHIFT)
+
+
+def test_interrupted_write_releases_shift(recording, monkeypatch):
+  class Interrupted(Keyboard.RecordingBackend):
+    def sendInput(self, count, inputs, size):
+      super().sendInput(count, inputs, size)
+      if self.calls == 1:
+        raise KeyboardInterrupt
+
+  backend = Interrupted()
+  Keyboard.setBackend(backend)
+  # a down, a up, shift down, then the interrupt with shift still held
+  monkeypatch.setattr(Keyboard, "MAX_BATCH", 3)
+  with pytest.raises(KeyboardInterrupt):
+    Keyboard.keyboardWrite("aB")
+  assert backend.calls == 2
+  assert len(backend.events) == 4
+  assert backend.keys()[-1] == (SHIFT, Keyboard.KEYEVENTF_KEYUP)
+  assert backend.down == set()
+
+
+@pytest.mark.parametrize("text", ["hello", "ABcd", "aBcD", "Hi!"])
+def test_unbatched_sends_the_same_events_one_per_call(recording, text):
+  Keyboard.keyboardWrite(text)
+  batched: list[tuple[int, int]] = recording.keys()
+  recording.clear()
+  Keyboard.keyboardWrite(text, batched=False)
+  assert recording.keys() == batched
+  assert recording.calls == len(batched)
+  assert recording.down == set()
+
+
+def test_unbatched_rejects_unknown_characters_before_sending(recording, capsys):
+  assert Keyboard.keyboardWrite("ab\x00", batched=False) is Keyboard.exit_code
+  assert "is not in vk_codes map" in capsys.readouterr().out
+  assert recording.calls == 0
+
+
+def test_interrupted_unbatched_write_releases_shift(recording):
+  class Interrupted(Keyboard.RecordingBackend):
+    def sendInput(self, count, inputs, size):
+      super().sendInput(count, inputs, size)
+      if self.calls == 3:
+        raise KeyboardInterrupt
+
+  backend = Interrupted()
+  Keyboard.setBackend(backend)
+  # a down, a up, shift down, then the interrupt with shift still held
+  with pytest.raises(KeyboardInterrupt):
+    Keyboard.keyboardWrite("aB", batched=False)
+  assert backend.calls == 4
+  assert backend.keys()[-1] == (SHIFT, Keyboard.KEYEVENTF_KEYUP)
+  assert backend.down == set()
+
+
+def run_macro(source: str) -> list[tuple[int, int]]:
+  Keyboard.runMacro(source, sleep=lambda seconds: None)
+  return Keyboard.getBackend().keys()
+
+
+def test_bare_modifier_under_a_held_one_is_not_doubled(recording):
+  up: int = Keyboard.KEYEVENTF_KEYUP
+  # Quoted text is literal, so shift lifts for "a" and comes back after
+  assert run_macro('+shift shift "a"') == [
+    (SHIFT, 0), (SHIFT, up), (0x41, 0), (0x41, up), (SHIFT, 0), (SHIFT, up)
+  ]
+
+
+def test_bare_modifier_tap_goes_through_the_state(recording):
+  up: int = Keyboard.KEYEVENTF_KEYUP
+  assert run_macro('shift "A" ctrl') == [
+    (SHIFT, 0), (SHIFT, up),
+    (SHIFT, 0), (0x41, 0), (0x41, up), (SHIFT, up),
+    (0x11, 0), (0x11, up)
+  ]
+  assert recording.down == set()
@@ -0,0 +1,74 @@
+import ctypes
+
+import pytest
+
+from controller import Keyboard
+
+Motion = Keyboard.Motion
+
+
+@pytest.mark.parametrize("ease", [None, Motion.easeInOut])
+def test_linear_ends_on_the_target(ease):
+  points = Motion.linear((10, 20), (110, 70), 50, ease)
+  assert len(points) == 50
+  assert points[-1] == (110, 70)
+  # The start is where the cursor already is, it is never sent again
+  assert ease or points[0] != (10, 20)
+  xs = [x for x, y in points]
+  assert xs == sorted(xs)
+
+
+def test_ease_starts_and_finishes_slowly():
+  points = Motion.linear((0, 0), (1000, 0), 10, Motion.easeInOut)
+  steps = [b[0] - a[0] for a, b in zip([(0, 0)] + points, points)]
+  assert steps[0] < steps[4] and steps[-1] < steps[5]
+
+
+def test_bezier_arcs_off_the_line_and_ends_on_the_target():
+  points = Motion.bezier((0, 500), (1000, 500), 20)
+  assert len(points) == 20 and points[-1] == (1000, 500)
+  assert any(y != 500 for x, y in points[:-1])
+  # Controls on the line give a straight path
+  straight = Motion.bezier((0, 500), (1000, 500), 20, controls=((333, 500), (667, 500)))
+  assert all(y == 500 for x, y in straight)
+
+
+@pytest.mark.parametrize("screen", [(1920, 1080), (2560, 1440), (1366, 768), (1, 1)])
+def test_records_round_trip_to_pixels(screen):
+  width, height = screen
+  points = [(0, 0), (width - 1, height - 1), (width // 2, height // 3), (7, 5)]
+  points = [(min(x, width - 1), min(y, height - 1)) for x, y in points]
+  data: bytes = Motion.toRecords(points, screen)
+  size: int = ctypes.sizeof(Keyboard.INPUT)
+  assert len(data) == len(points) * size
+  for i, point in enumerate(points):
+    event = Keyboard.INPUT.from_buffer_copy(data[i * size:(i + 1) * size])
+    assert event.type == Keyboard.INPUT_MOUSE
+    assert event.mi.dwFlags == Keyboard.MOUSEEVENTF_MOVE | Keyboard.MOUSEEVENTF_ABSOLUTE
+    assert 0 <= event.mi.dx <= 65535 and 0 <= event.mi.dy <= 65535
+    assert Motion.fromAbsolute(event.mi.dx, event.mi.dy, screen) == point
+
+
+def test_glide_sends_one_batch_per_frame(recording, clock):
+  recording.cursor = (0, 0)
+  sleeps: list[float] = []
+  frames: list[int] = []
+
+  def sleep(seconds: float) -> None:
+    sleeps.append(seconds)
+    frames.append(len(recording.events))
+    # Each frame's send costs 4 ms, the deadlines soak it up
+    clock.advance(seconds + 0.004)
+
+  # 30 points over 15 frames of a 60 Hz quarter second
+  Keyboard.glideCursor(300, 150, duration=0.25, rate=120, sleep=sleep, clock=clock)
+  assert recording.calls == 15
+  assert frames == list(range(2, 30, 2))
+  assert sleeps[0] == pytest.approx(1 / 60)
+  assert sleeps[1:] == pytest.approx([1 / 60 - 0.004] * 13)
+  assert recording.cursor == (300, 150)
+
+
+def test_glide_rejects_unknown_paths(recording):
+  assert Keyboard.glideCursor(1, 1, path="zigzag") is Keyboard.exit_code
+  assert recording.calls == 0
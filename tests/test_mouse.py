@@ -0,0 +1,72 @@
+import pytest
+
+from controller import Keyboard
+
+ABSOLUTE_MOVE: int = Keyboard.MOUSEEVENTF_MOVE | Keyboard.MOUSEEVENTF_ABSOLUTE
+
+
+def buttons(backend) -> list[tuple[int, int]]:
+  # (dwFlags, mouseData) of every mouse event that is not a move
+  return [(event.mi.dwFlags, event.mi.mouseData) for event in backend.events
+          if not event.mi.dwFlags & Keyboard.MOUSEEVENTF_MOVE]
+
+
+@pytest.mark.parametrize("button, down, up, data", [
+  ("left_mouse", 0x0002, 0x0004, 0),
+  ("right_mouse", 0x0008, 0x0010, 0),
+  ("middle_mouse", 0x0020, 0x0040, 0),
+  ("mouse_button1", 0x0080, 0x0100, 1),
+  ("mouse_button2", 0x0080, 0x0100, 2),
+])
+def test_click_flags(recording, button, down, up, data):
+  Keyboard.pressAndReleaseMouse(button)
+  Keyboard.pressMouse(button)
+  Keyboard.releaseMouse(button)
+  assert buttons(recording) == [(down, data), (up, data)] * 2
+  assert all(event.type == Keyboard.INPUT_MOUSE for event in recording.events)
+
+
+def test_keys_are_not_mouse_buttons(recording, capsys):
+  assert Keyboard.pressAndReleaseMouse("a") is Keyboard.exit_code
+  assert "not a mouse button" in capsys.readouterr().out
+  assert recording.calls == 0
+
+
+def test_double_click_is_one_call(recording):
+  Keyboard.doubleClickMouse("right_mouse")
+  assert recording.calls == 1
+  assert buttons(recording) == [(0x0008, 0), (0x0010, 0)] * 2
+
+
+def test_double_click_with_a_gap(recording):
+  gaps: list[float] = []
+  Keyboard.doubleClickMouse("left_mouse", gap=0.1, sleep=gaps.append)
+  assert gaps == [0.1] and recording.calls == 2
+  assert Keyboard.doubleClickMouse(gap=0.5) is Keyboard.exit_code
+  assert recording.calls == 2
+
+
+def test_drag_is_one_call(recording):
+  recording.cursor = (100, 100)
+  Keyboard.dragMouse(500, 300, steps=16)
+  assert recording.calls == 1
+  events = recording.events
+  assert len(events) == 18
+  assert (events[0].mi.dwFlags, events[-1].mi.dwFlags) == (0x0002, 0x0004)
+  assert all(event.mi.dwFlags == ABSOLUTE_MOVE for event in events[1:-1])
+  assert recording.cursor == (500, 300)
+
+
+def test_gestures_are_not_split_by_the_rate_limiter(recording, clock):
+  waits: list[float] = []
+  Keyboard.rate_limiter = Keyboard.RateLimiter(100, 4, clock, waits.append)
+  Keyboard.dragMouse(500, 300, steps=32)
+  assert recording.calls == 1
+  # All 34 tokens in one acquire, 30 of them borrowed
+  assert waits == [pytest.approx(0.3)]
+  Keyboard.doubleClickMouse()
+  Keyboard.nudgeMouse(1)
+  assert recording.calls == 3
+  # Everything else is still chunked at burst
+  Keyboard.keyboardWrite("abcdef")
+  assert recording.calls == 6
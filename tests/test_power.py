@@ -0,0 +1,59 @@
+import threading
+
+from engine import Engine, FakePowerBackend, PowerStrategy
+
+CONTINUOUS: int = PowerStrategy.ES_CONTINUOUS
+SYSTEM: int = PowerStrategy.ES_SYSTEM_REQUIRED
+DISPLAY: int = PowerStrategy.ES_DISPLAY_REQUIRED
+
+
+def test_flags():
+  assert PowerStrategy(backend=FakePowerBackend()).flags == CONTINUOUS | SYSTEM | DISPLAY
+  assert PowerStrategy(display=False, backend=FakePowerBackend()).flags == CONTINUOUS | SYSTEM
+
+
+def test_acquired_while_running_and_released_on_pause_and_stop(recording, clock, wait_for):
+  backend = FakePowerBackend()
+  held: int = CONTINUOUS | SYSTEM | DISPLAY
+  engine = Engine("f15", 300, PowerStrategy(backend=backend), clock=clock)
+  worker = threading.Thread(target=engine.start, daemon=True)
+  worker.start()
+
+  wait_for(lambda: backend.requests == [held])
+  assert backend.state == held
+
+  engine.pause()
+  wait_for(lambda: backend.requests == [held, CONTINUOUS])
+  assert backend.state == CONTINUOUS
+
+  engine.resume()
+  wait_for(lambda: backend.requests == [held, CONTINUOUS, held])
+
+  engine.stop()
+  worker.join(2)
+  assert not worker.is_alive()
+  assert backend.requests == [held, CONTINUOUS, held, CONTINUOUS]
+  assert backend.state == CONTINUOUS
+  # Nothing is ever injected, and the worker never ticked
+  assert recording.events == []
+  assert engine.wakeups == 3
+
+
+def test_requests_are_not_repeated():
+  backend = FakePowerBackend()
+  strategy = PowerStrategy(backend=backend)
+  strategy.acquire()
+  strategy.acquire()
+  strategy.release()
+  strategy.release()
+  assert backend.requests == [CONTINUOUS | SYSTEM | DISPLAY, CONTINUOUS]
+
+
+def test_started_paused_never_acquires(recording, clock):
+  backend = FakePowerBackend()
+  engine = Engine("f15", 300, PowerStrategy(backend=backend), paused=True, clock=clock)
+  worker = threading.Thread(target=engine.start, daemon=True)
+  worker.start()
+  engine.stop()
+  worker.join(2)
+  assert backend.requests == []
@@ -0,0 +1,72 @@
+import pytest
+
+from controller import Keyboard
+
+
+def limiter(clock, rate: float = 100, burst: int | None = 10):
+  waits: list[float] = []
+
+  def sleep(seconds: float) -> None:
+    waits.append(seconds)
+    clock.advance(seconds)
+  return Keyboard.RateLimiter(rate, burst, clock, sleep), waits
+
+
+@pytest.mark.parametrize("rate, burst", [(True, None), (0, None), (-5, None), ("100", None), (100, 0), (100, True)])
+def test_bad_settings_are_reported(recording, capsys, rate, burst):
+  assert Keyboard.setRateLimit(rate, burst) is Keyboard.exit_code
+  assert "PARAMETER" in capsys.readouterr().out
+  assert Keyboard.rate_limiter is None
+
+
+def test_set_and_clear(recording):
+  rate_limiter = Keyboard.setRateLimit(500)
+  assert Keyboard.rate_limiter is rate_limiter
+  # A tenth of a second worth by default
+  assert rate_limiter.burst == 50
+  assert Keyboard.setRateLimit(None) is None and Keyboard.rate_limiter is None
+
+
+def test_streams_are_chunked_at_burst(recording, clock):
+  Keyboard.rate_limiter, waits = limiter(clock, burst=4)
+  Keyboard.keyboardWrite("abcdefgh")
+  assert recording.calls == 4
+  assert len(recording.events) == 16
+
+
+def test_debt_is_paid_back_by_sleeping(recording, clock):
+  rate_limiter, waits = limiter(clock)
+  # The first burst is free, then every chunk waits for its own tokens
+  for _ in range(100):
+    rate_limiter.acquire(10)
+  assert rate_limiter.events == 1000
+  assert clock() == pytest.approx(9.9)
+  assert rate_limiter.throttled == pytest.approx(9.9)
+  assert waits[0] == pytest.approx(0.1) and len(waits) == 99
+  assert rate_limiter.throughput() == pytest.approx(1000 / 9.9)
+
+
+def test_tokens_refill_while_idle_up_to_burst(recording, clock):
+  rate_limiter, waits = limiter(clock)
+  rate_limiter.acquire(10)
+  clock.advance(60)
+  # A minute idle still only buys one burst
+  rate_limiter.acquire(10)
+  assert waits == []
+  rate_limiter.acquire(5)
+  assert waits == [pytest.approx(0.05)]
+
+
+def test_sending_through_the_limiter(recording, clock):
+  Keyboard.rate_limiter, waits = limiter(clock)
+  Keyboard.keyboardWrite("a" * 500)
+  assert len(recording.events) == 1000 and recording.calls == 100
+  assert clock() == pytest.approx(9.9)
+
+
+def test_reset_zeroes_the_counters(clock):
+  rate_limiter, waits = limiter(clock)
+  assert rate_limiter.throughput() == 0.0
+  rate_limiter.acquire(30)
+  rate_limiter.reset()
+  assert (rate_limiter.events, rate_limiter.throttled, rate_limiter.throughput()) == (0, 0.0, 0.0)
@@ -0,0 +1,65 @@
+import ctypes
+
+import pytest
+
+from controller import Keyboard
+
+
+def recorder(tmp_path, clock, capacity: int = 16, segment: int = 4):
+  # Each record lands 2 ms after the last so every one is its own step
+  def stamp() -> int:
+    clock.advance(0.002)
+    return int(clock() * 1e9)
+  return Keyboard.InputRecorder(capacity, segment, str(tmp_path / "a.rec"), clock=stamp)
+
+
+def replayed(macro) -> int:
+  # INPUT records in a loaded macro, one per recorded key event
+  return sum(len(step) for step in macro.steps if isinstance(step, bytes)) // ctypes.sizeof(Keyboard.INPUT)
+
+
+def macro_keys(macro) -> list[tuple[int, int]]:
+  backend = Keyboard.RecordingBackend()
+  Keyboard.setBackend(backend)
+  Keyboard.runMacro(macro, sleep=lambda seconds: None)
+  return [key for key in backend.keys() if not key[1] & Keyboard.KEYEVENTF_KEYUP]
+
+
+@pytest.mark.parametrize("capacity, segment", [(100, 512), (0, 1), (16, 0), (16, True), (16.0, 4)])
+def test_bad_sizes_are_reported(capacity, segment, capsys):
+  assert Keyboard.recordInput(capacity, segment) is Keyboard.exit_code
+  assert capsys.readouterr().out
+  with pytest.raises(ValueError):
+    Keyboard.InputRecorder(capacity, segment)
+
+
+def test_capacity_rounds_down_to_whole_segments():
+  assert Keyboard.recordInput(100, 32).capacity == 96
+
+
+def test_load_after_stop(recording, clock, tmp_path):
+  rec = recorder(tmp_path, clock)
+  for vk in range(0x41, 0x47):
+    rec.push(vk, 0, 0)
+  rec.stop()
+  assert replayed(Keyboard.InputRecorder.load(str(tmp_path / "a.rec"))) == 6
+
+
+def test_load_without_stop_ignores_the_grown_area(recording, clock, tmp_path):
+  rec = recorder(tmp_path, clock)
+  for vk in range(0x41, 0x4B):
+    rec.push(vk, 0, 0)
+  # Two segments were streamed, the file is far bigger and zero filled
+  rec.map.flush()
+  path: str = str(tmp_path / "a.rec")
+  assert (tmp_path / "a.rec").stat().st_size > Keyboard.InputRecorder.header.size + 8 * 16
+  macro = Keyboard.InputRecorder.load(path)
+  assert replayed(macro) == 8
+  assert [vk for vk, flags in macro_keys(macro)] == list(range(0x41, 0x49))
+  rec.stop()
+
+
+def test_other_files_are_refused(tmp_path):
+  (tmp_path / "x").write_bytes(b"KCREC\x00\x01\x00" + bytes(64))
+  with pytest.raises(ValueError):
+    Keyboard.InputRecorder.load(str(tmp_path / "x"))
@@ -0,0 +1,92 @@
+import pytest
+
+from engine import DeadlineScheduler
+
+
+def run(scheduler: DeadlineScheduler, clock, seconds: float, step: float = 0.5) -> list[tuple[float, int]]:
+  # Polls like the worker does and returns (time, times fired) for every tick
+  fired: list[tuple[float, int]] = []
+  end: float = clock() + seconds
+  while clock() < end:
+    clock.advance(step)
+    runs: int = scheduler.poll()
+    if runs:
+      fired.append((clock(), runs))
+  return fired
+
+
+def test_deadlines_do_not_drift(clock):
+  scheduler = DeadlineScheduler(10, clock=clock)
+  # Every poll comes in 0.5 s late, the grid stays on whole multiples of 10
+  assert run(scheduler, clock, 100, step=0.5) == [(10.0 * n, 1) for n in range(1, 11)]
+  clock.advance(3.7)
+  assert scheduler.poll() == 0
+  clock.advance(6.3)
+  assert scheduler.poll() == 1
+  assert scheduler.deadline == 120.0
+
+
+@pytest.mark.parametrize("policy, runs", [
+  (DeadlineScheduler.SKIP, 1),
+  (DeadlineScheduler.CATCH_UP, 2),
+  (DeadlineScheduler.FIRE_ALL, 4),
+])
+def test_missed_ticks_follow_the_policy(clock, policy, runs):
+  scheduler = DeadlineScheduler(10, policy, clock=clock)
+  # Suspended from 0 to 45, the 10, 20, 30 and 40 ticks were missed
+  clock.advance(45)
+  assert scheduler.poll() == runs
+  assert list(scheduler.lateness) == [35.0]
+  # And the schedule carries on on the original grid
+  assert scheduler.deadline == 50.0
+  assert scheduler.poll() == 0
+
+
+def test_a_long_simulated_run_is_cheap(clock):
+  scheduler = DeadlineScheduler(1, DeadlineScheduler.FIRE_ALL, clock=clock)
+  fired: list[tuple[float, int]] = run(scheduler, clock, 30, step=1)
+  clock.advance(45)
+  fired.append((clock(), scheduler.poll()))
+  fired += run(scheduler, clock, 25, step=1)
+  # One run per simulated second, the suspend included
+  assert sum(runs for _, runs in fired) == 100
+
+
+def test_lateness_history_is_bounded(clock):
+  scheduler = DeadlineScheduler(1, clock=clock, history=4)
+  for n in range(10):
+    clock.now = scheduler.deadline + n / 100
+    scheduler.poll()
+  # Only the newest four, newest last
+  assert list(scheduler.lateness) == pytest.approx([0.06, 0.07, 0.08, 0.09])
+
+
+def test_unknown_policy_is_refused(clock):
+  with pytest.raises(ValueError):
+    DeadlineScheduler(10, "sometimes", clock=clock)
+
+
+def test_longer_interval_moves_the_current_deadline(clock):
+  scheduler = DeadlineScheduler(300, clock=clock)
+  clock.advance(100)
+  scheduler.set_interval(600)
+  assert scheduler.time_left() == 500
+
+
+@pytest.mark.parametrize("policy", DeadlineScheduler.POLICIES)
+def test_shorter_interval_never_counts_as_missed(clock, policy):
+  scheduler = DeadlineScheduler(300, policy, clock=clock)
+  clock.advance(290)
+  scheduler.set_interval(10)
+  # Due straight away, once, whatever the policy
+  assert scheduler.time_left() == 0
+  assert scheduler.poll() == 1
+  assert scheduler.deadline == 300.0
+  assert list(scheduler.lateness) == [0.0]
+
+
+def test_reset_anchors_on_now(clock):
+  scheduler = DeadlineScheduler(10, DeadlineScheduler.FIRE_ALL, clock=clock)
+  clock.advance(95)
+  scheduler.reset()
+  assert scheduler.time_left() == 10
@@ -0,0 +1,83 @@
+from controller import Keyboard
+
+
+class FakeTimer:
+  """
+  Stands in for threading.Timer, fired by hand
+  """
+  started: list["FakeTimer"] = []
+
+  def __init__(self, interval, function, args=()) -> None:
+    self.interval = interval
+    self.function = function
+    self.args = args
+    self.cancelled: bool = False
+
+  def start(self) -> None:
+    FakeTimer.started.append(self)
+
+  def cancel(self) -> None:
+    self.cancelled = True
+
+  def fire(self) -> None:
+    self.function(*self.args)
+
+
+def signed(value: int) -> int:
+  # mouseData is a DWORD, negative wheel deltas come back wrapped
+  return value - (1 << 32) if value >= 1 << 31 else value
+
+
+def wheel(backend) -> list[tuple[int, int]]:
+  return [(event.mi.dwFlags, signed(event.mi.mouseData)) for event in backend.events]
+
+
+def test_deltas_merge_within_the_window(recording, clock):
+  FakeTimer.started.clear()
+  scroller = Keyboard.Scroller(0.05, clock, timer=FakeTimer)
+  for _ in range(10):
+    scroller.scroll("v", -1)
+    clock.advance(0.001)
+  scroller.scroll("h", 3)
+  assert recording.calls == 0
+  assert len(FakeTimer.started) == 1
+  FakeTimer.started[0].fire()
+  assert recording.calls == 1
+  assert wheel(recording) == [(0x0800, -10), (0x1000, 3)]
+
+
+def test_a_stale_timer_leaves_the_next_window_alone(recording, clock):
+  FakeTimer.started.clear()
+  scroller = Keyboard.Scroller(0.05, clock, timer=FakeTimer)
+  scroller.scroll("v", 1)
+  clock.advance(0.06)
+  # Window ran out, so this flushes the first delta and opens a new one
+  scroller.scroll("v", 2)
+  first, second = FakeTimer.started
+  assert first.cancelled and recording.calls == 1
+  first.fire()
+  assert recording.calls == 1
+  second.fire()
+  assert wheel(recording) == [(0x0800, 1), (0x0800, 2)]
+
+
+def test_timer_flushes_without_another_call(recording, wait_for):
+  scroller = Keyboard.Scroller(0.01)
+  scroller.scroll("v", 1)
+  scroller.scroll("v", 1)
+  wait_for(lambda: recording.calls == 1)
+  assert wheel(recording) == [(0x0800, 2)]
+
+
+def test_without_autoflush_nothing_goes_out_until_flush(recording, clock):
+  with Keyboard.Scroller(0.05, clock, autoflush=False) as scroller:
+    scroller.scroll("v", 1)
+    clock.advance(1)
+    assert recording.calls == 0
+  assert wheel(recording) == [(0x0800, 1)]
+
+
+def test_scroll_sequence_is_one_call(recording):
+  Keyboard.scrollSequence([("up", 1), ("up", 2), ("left", 1), ("down", 4)])
+  assert recording.calls == 1
+  assert wheel(recording) == [(0x0800, 3), (0x1000, -1), (0x0800, -4)]
@@ -0,0 +1,115 @@
+import multiprocessing
+import os
+import struct
+import time
+
+import pytest
+
+from controller import Keyboard
+from engine import Engine, KeyPressStrategy, StatusBlock, read_status
+
+
+def slow_write(block: StatusBlock):
+  # Writes the record 8 bytes at a time, as if the writer were preempted halfway through every publish
+  def write(data: bytes) -> None:
+    for start in range(StatusBlock.SEQ.size, len(data), 8):
+      block.map[start:min(start + 8, len(data))] = data[start:start + 8]
+      time.sleep(0)
+  return write
+
+
+def consistent(snapshot: dict) -> bool:
+  n: int = snapshot["injected"]
+  return (snapshot["failures"] == n and snapshot["interval"] == n % 1000 + 1
+          and snapshot["last_fire"] == float(n) and snapshot["next_deadline"] == n * 2.0)
+
+
+@pytest.fixture
+def name() -> str:
+  return f"kc-test-status-{os.getpid()}"
+
+
+def test_nothing_published_reads_as_none(name):
+  assert read_status(name) is None
+
+
+def test_round_trip(name):
+  block = StatusBlock(name)
+  try:
+    block.publish("running", Keyboard.vk_codes["f15"], 300, 1.5, 2.5, 3, 4)
+    status = read_status(name)
+    assert status["state"] == "running"
+    assert status["key"] == "f15"
+    assert (status["interval"], status["last_fire"], status["next_deadline"]) == (300, 1.5, 2.5)
+    assert (status["injected"], status["failures"], status["pid"]) == (3, 4, os.getpid())
+    assert status["seq"] == 2
+  finally:
+    block.close()
+  assert read_status(name) is None
+
+
+def test_readers_never_see_a_torn_snapshot(name):
+  writer_block = StatusBlock(name)
+  writer_block.publish("paused", 0x7E, 1, 0.0, 0.0, 0, 0)
+  context = multiprocessing.get_context("fork")
+  stop = context.Event()
+
+  def write() -> None:
+    # Only the writer process gets the slow copy
+    writer_block.write = slow_write(writer_block)
+    n: int = 0
+    while not stop.is_set():
+      n += 1
+      writer_block.publish("paused", 0x7E, n % 1000 + 1, float(n), n * 2.0, n, n)
+      # Short enough to keep racing the reader, long enough that reads get through
+      time.sleep(0.00001)
+
+  writer = context.Process(target=write, daemon=True)
+  writer.start()
+  try:
+    reader = StatusBlock(name, create=False)
+    seen: set[int] = set()
+    for _ in range(20000):
+      # None only means every retry raced a write, this writer never pauses
+      snapshot = reader.read()
+      if snapshot is not None:
+        assert consistent(snapshot), snapshot
+        seen.add(snapshot["seq"])
+    reader.close()
+    # The writer really was racing the reader the whole time
+    assert len(seen) > 100
+  finally:
+    stop.set()
+    writer.join(5)
+    writer_block.close()
+
+
+def test_a_failed_publish_leaves_the_last_snapshot_readable(name):
+  block = StatusBlock(name)
+  try:
+    # Past the old uint32 field, fits now
+    block.publish("running", 0x7E, 5000000000, 1.0, 2.0, 3, 4)
+    assert read_status(name)["interval"] == 5000000000
+    with pytest.raises(struct.error):
+      block.publish("running", 0x7E, 2 ** 64, 1.0, 2.0, 3, 4)
+    assert block.seq % 2 == 0
+    status = read_status(name)
+    assert (status["seq"], status["interval"]) == (2, 5000000000)
+    block.publish("paused", 0x7E, 60, 1.0, 2.0, 3, 4)
+    assert read_status(name)["state"] == "paused"
+  finally:
+    block.close()
+
+
+def test_engine_publishes_its_state(recording, clock, name, tmp_path):
+  engine = Engine("f15", 300, KeyPressStrategy(Keyboard.vk_codes["f15"]), clock=clock)
+  engine.start_services(str(tmp_path / "kc.sock"), name)
+  try:
+    assert read_status(name)["state"] == "running"
+    engine.set_interval(60)
+    engine.pause()
+    status = read_status(name)
+    assert (status["state"], status["interval"], status["next_deadline"]) == ("paused", 60, 0.0)
+  finally:
+    engine.stop()
+  assert read_status(name) is None
@@ -0,0 +1,86 @@
+import pytest
+
+from controller import Keyboard
+
+
+class ChunkBackend(Keyboard.RecordingBackend):
+  # Also keeps how many events every SendInput call carried
+
+  def __init__(self) -> None:
+    super().__init__()
+    self.counts: list[int] = []
+
+  def sendInput(self, count, inputs, size):
+    self.counts.append(count)
+    return super().sendInput(count, inputs, size)
+
+
+def virtual(backend) -> list[tuple[int, int]]:
+  # (vk, is up) of every keyboard event that is not unicode
+  return [(vk, flags & Keyboard.KEYEVENTF_KEYUP) for vk, flags in backend.keys()
+          if not flags & Keyboard.KEYEVENTF_UNICODE]
+
+
+def units(backend) -> list[tuple[int, bool]]:
+  # (wScan, is up) of every unicode event
+  return [(event.ki.wScan, bool(event.ki.dwFlags & Keyboard.KEYEVENTF_KEYUP))
+          for event in backend.events if event.ki.dwFlags & Keyboard.KEYEVENTF_UNICODE]
+
+
+@pytest.fixture
+def chunks(recording):
+  backend = ChunkBackend()
+  Keyboard.setBackend(backend)
+  return backend
+
+
+def test_surrogate_pairs_are_sent_as_two_units(recording):
+  Keyboard.unicodeWrite("\U0001f600")
+  assert units(recording) == [(0xD83D, False), (0xD83D, True), (0xDE00, False), (0xDE00, True)]
+  assert virtual(recording) == []
+
+
+@pytest.mark.parametrize("text, vk", [("\n", 0x0D), ("\t", 0x09), ("\r\n", 0x0D)])
+def test_newlines_and_tabs_are_real_keys(recording, text, vk):
+  Keyboard.unicodeWrite("a" + text + "b")
+  assert virtual(recording) == [(vk, 0), (vk, Keyboard.KEYEVENTF_KEYUP)]
+  assert units(recording) == [(ord("a"), False), (ord("a"), True), (ord("b"), False), (ord("b"), True)]
+
+
+def test_chunk_size_sets_events_per_call(chunks):
+  Keyboard.unicodeWrite("x" * 100, chunk_size=64)
+  assert chunks.counts == [64, 64, 64, 8]
+
+
+@pytest.mark.parametrize("chunk_size", [2, 3, 5, 7])
+def test_odd_chunk_sizes_never_split_a_character(chunks, chunk_size):
+  Keyboard.unicodeWrite("abcdefg", chunk_size=chunk_size)
+  assert all(count % 2 == 0 and count <= chunk_size for count in chunks.counts)
+  assert sum(chunks.counts) == 14
+
+
+@pytest.mark.parametrize("chunk_size", [2, 4, 5, 6])
+def test_surrogate_pairs_never_straddle_calls(chunks, chunk_size):
+  text: str = "a\U0001f600b\U0001f601\U0001f602c"
+  Keyboard.unicodeWrite(text, chunk_size=chunk_size)
+  sent: list[tuple[int, bool]] = units(chunks)
+  start: int = 0
+  for count in chunks.counts:
+    scans: list[int] = [scan for scan, up in sent[start:start + count]]
+    assert not 0xD800 <= scans[-1] <= 0xDBFF
+    assert not 0xDC00 <= scans[0] <= 0xDFFF
+    start += count
+  assert start == len(sent) == 2 * len(text.encode("utf-16-le")) // 2
+
+
+def test_a_small_burst_does_not_split_a_character(chunks, clock):
+  Keyboard.rate_limiter = Keyboard.RateLimiter(1000, 1, clock, clock.advance)
+  Keyboard.unicodeWrite("abc")
+  assert chunks.counts == [2, 2, 2]
+
+
+@pytest.mark.parametrize("chunk_size", [0, 1, -2, 2.0, True, "4"])
+def test_bad_chunk_sizes_are_reported(recording, capsys, chunk_size):
+  assert Keyboard.unicodeWrite("abc", chunk_size=chunk_size) is Keyboard.exit_code
+  assert "chunk_size" in capsys.readouterr().out
+  assert recording.calls == 0